@@ -0,0 +1,387 @@
+"""
+Kararlı Durum Heap Tahsisi Ölçümü
+Örnekleme döngüsünün her aşamasını ve tam döngü turunu (WiFi poll, sensör okuma,
+füzyon, HTTP gönderimi) ısınmadan sonra heap kilitliyken çalıştırır; kilit altında
+yapılan her tahsis MemoryError ile yakalanır
+
+Host:  micropython bench_alloc.py   (MicroPython unix portu; I2C, WiFi, soket ve
+                                     config yerine sahte modüller kullanılır)
+Cihaz: import bench_alloc           (gerçek sensörler, WiFi ve backend ile;
+                                     config.py'de STEADY_STATE_MODE = True olmalı)
+"""
+
+import gc
+import struct
+import sys
+from array import array
+
+import micropython
+
+WARMUP = 10
+CYCLES = 200
+
+# 2025-05-08T06:13:20Z (2000-01-01'den beri saniye)
+SAMPLE_UTC = 800000000
+
+ON_DEVICE = sys.platform == "esp32"
+
+
+# --- Host için sahte donanım/ağ modülleri (cihazda kullanılmaz) ---------------
+
+
+class _StandInConfig:
+    API_SERVER_URL = "http://bench.local:3000"
+    API_ENDPOINT = "/api/sensors"
+    BUFFER_MAX_SIZE = 50
+    DEVICE_ID = "esp32-besik-01"
+    RETRY_ATTEMPTS = 3
+    RETRY_DELAY = 2
+    SEND_INTERVAL = 5
+    WIFI_SSID = "bench"
+    WIFI_PASSWORD = "bench"
+    WIFI_TIMEOUT = 1
+    WIFI_RETRY_DELAY = 1
+    WIFI_RETRY_ATTEMPTS = 1
+    NTP_SERVER = "127.0.0.1"
+    STEADY_STATE_MODE = True
+    GC_IDLE_BYTES = 4096
+    STATUS_SERVER_ENABLED = False
+    STATUS_PORT = 80
+    STATUS_MAX_CLIENTS = 2
+
+
+# Backend cevabı ve NTP cevabı (2025-05-08T06:13:20Z) önceden hazırlanır
+_HTTP_REPLY = b'HTTP/1.1 201 Created\r\nContent-Length: 11\r\n\r\n{"ok":true}'
+_NTP_REPLY = struct.pack("!40xII", 3155673600 + SAMPLE_UTC, 0)
+
+
+class _StandInSocket:
+    """TCP (keep-alive HTTP) ve UDP (SNTP) soketinin yerine geçer"""
+
+    def __init__(self, *args):
+        self._read = 0
+        self._ntp = False
+
+    def settimeout(self, value):
+        pass
+
+    def setblocking(self, flag):
+        pass
+
+    def setsockopt(self, *args):
+        pass
+
+    def connect(self, addr):
+        pass
+
+    def sendto(self, data, addr):
+        self._ntp = True
+        return len(data)
+
+    def recv(self, n):
+        if not self._ntp:
+            raise OSError(11)  # EAGAIN
+        self._ntp = False
+        return _NTP_REPLY
+
+    def write(self, buf, n=-1):
+        # Yeni istek: cevap baştan okunacak
+        self._read = 0
+        return len(buf) if n < 0 else n
+
+    def readinto(self, buf, n=-1):
+        size = len(buf) if n < 0 else n
+        count = 0
+        while count < size and self._read < len(_HTTP_REPLY):
+            buf[count] = _HTTP_REPLY[self._read]
+            count += 1
+            self._read += 1
+        return count
+
+    def close(self):
+        pass
+
+
+class _StandInSocketModule:
+    AF_INET = 2
+    SOCK_DGRAM = 2
+    SOL_SOCKET = 1
+    SO_REUSEADDR = 2
+    socket = _StandInSocket
+
+    @staticmethod
+    def getaddrinfo(host, port):
+        return [(2, 1, 0, "", (host, port))]
+
+
+class _StandInWLAN:
+    def __init__(self, interface):
+        pass
+
+    def active(self, flag):
+        pass
+
+    def isconnected(self):
+        return True
+
+    def connect(self, ssid, password):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def ifconfig(self):
+        return ("192.168.1.50", "255.255.255.0", "192.168.1.1", "192.168.1.1")
+
+    def status(self, key):
+        return -60
+
+
+class _StandInNetwork:
+    STA_IF = 0
+    WLAN = _StandInWLAN
+
+
+class _StandInEsp:
+    @staticmethod
+    def osdebug(level):
+        pass
+
+
+def _bme280_registers():
+    """BME280 kalibrasyon ve ölçüm register'ları (~24.5°C, ~%45)"""
+    h4, h5 = 313, 50
+    return {
+        0xD0: bytes([0x60]),
+        0x88: struct.pack(
+            "<HhhHhhhhhhhh",
+            27504, 26435, -1000, 36477, -10685, 3024, 2855, 140, -7, 15500, -14600, 6000,
+        ),
+        0xA1: bytes([75]),
+        0xE1: struct.pack(
+            "<hBBBBb", 362, 0, h4 >> 4, (h4 & 0x0F) | ((h5 & 0x0F) << 4), h5 >> 4, 30
+        ),
+        # basınç (3) + sıcaklık (3) + nem (2)
+        0xF7: bytes([0x65, 0x5A, 0xC0, 0x7E, 0xED, 0x00, 0x6C, 0x20]),
+    }
+
+
+def _mlx90614_registers():
+    """MLX90614 SMBus adresi ve sıcaklık register'ları (ortam 24.5°C, nesne 36.7°C)"""
+    return {
+        0x2E: bytes([0x5A, 0x00]),
+        0x06: struct.pack("<H", 14883),
+        0x07: struct.pack("<H", 15493),
+    }
+
+
+class _StandInI2C:
+    def __init__(self, *args, **kwargs):
+        self.devices = {0x5A: _mlx90614_registers(), 0x76: _bme280_registers()}
+
+    def scan(self):
+        return sorted(self.devices)
+
+    def readfrom_mem(self, address, reg, n):
+        return self.devices[address][reg][:n]
+
+    def readfrom_mem_into(self, address, reg, buf):
+        data = self.devices[address][reg]
+        for i in range(len(buf)):
+            buf[i] = data[i]
+
+    def writeto_mem(self, address, reg, data):
+        pass
+
+
+class _StandInPin:
+    IN = 1
+    PULL_UP = 2
+
+    def __init__(self, *args):
+        pass
+
+
+class _StandInRTC:
+    def datetime(self, value):
+        pass
+
+
+class _StandInMachine:
+    I2C = _StandInI2C
+    Pin = _StandInPin
+    RTC = _StandInRTC
+
+
+def install_stand_ins():
+    """Host'ta donanım, ağ ve config modüllerinin yerine sahtelerini koy"""
+    sys.modules["config"] = _StandInConfig
+    sys.modules["socket"] = _StandInSocketModule
+    sys.modules["network"] = _StandInNetwork
+    sys.modules["esp"] = _StandInEsp
+    sys.modules["machine"] = _StandInMachine
+
+
+# --- Ölçüm --------------------------------------------------------------------
+
+
+def measure(name, fn, cycles=CYCLES):
+    """fn'i heap kilitliyken cycles kez çalıştır, döngü başına tahsis sonucunu yazdır"""
+    for _ in range(WARMUP):
+        fn()
+
+    gc.collect()
+    before = gc.mem_alloc()
+    done = 0
+
+    micropython.heap_lock()
+    try:
+        for _ in range(cycles):
+            fn()
+            done += 1
+    except MemoryError:
+        pass
+    finally:
+        micropython.heap_unlock()
+
+    grown = gc.mem_alloc() - before
+    if done == cycles and grown == 0:
+        print(f"✓ {name}: 0 bytes/cycle ({cycles} cycles)")
+        return True
+
+    print(f"✗ {name}: heap allocation on cycle {done + 1}")
+    return False
+
+
+def run():
+    if not ON_DEVICE:
+        install_stand_ins()
+
+    from fusion import Fusion
+    from history import DataBuffer, RollupTier
+    from record import (
+        R_BODY,
+        R_HUM,
+        R_INSTALL,
+        R_SEQ,
+        R_TEMP,
+        R_TS,
+        JsonEncoder,
+        new_bucket,
+        new_record,
+    )
+    from timebase import Timebase
+
+    # main import edilince boot WiFi'ya bağlanır ve ilk NTP senkronizasyonu yapılır
+    import main
+
+    print(f"\n🧪 Allocation benchmark ({sys.platform})")
+    if not main.STEADY_STATE_MODE:
+        print("⚠️  STEADY_STATE_MODE kapalı: döngü logları tahsis olarak görünecek")
+
+    clock = Timebase()
+    rec = new_record()
+    tmp = new_record()
+    buffer = DataBuffer(max_size=50, verbose=False)
+    encoder = JsonEncoder("esp32-besik-01", 7)
+
+    # Dolu buffer: her eklemede en eski kayıt dakika/çeyrek kovalarına toplanır
+    quarter = RollupTier(900, 4)
+    minute = RollupTier(60, 4, next_tier=quarter)
+    history = DataBuffer(max_size=4, verbose=False, rollup=minute)
+    bucket = new_bucket()
+
+    # İki sıcaklık kanalı + bir vücut sıcaklığı kanalı; okumalar her döngüde değişir
+    fusion = Fusion(
+        [
+            (R_TEMP, 0, 50, 1, "bme"),
+            (R_TEMP, 1, 200, 100, "dht"),
+            (R_BODY, 2, 50, 2, "mlx"),
+        ]
+    )
+    raw = array("i", [2450, 2500, 3670])
+
+    rec[R_TEMP] = 2456
+    rec[R_HUM] = -1000000
+    rec[R_BODY] = 3672
+    rec[R_SEQ] = 123456
+    rec[R_INSTALL] = 424242
+
+    def stamp():
+        rec[R_TS] = clock.now()
+
+    def buffer_cycle():
+        buffer.add(rec)
+        buffer.peek(tmp)
+        buffer.drop()
+
+    def rollup_cycle():
+        rec[R_TS] += 5
+        rec[R_SEQ] += 1
+        history.add(rec)
+
+    def fuse():
+        rec[R_TS] += 5
+        raw[0] = 2450 + rec[R_TS] % 7
+        raw[2] = 3670 - rec[R_TS] % 11
+        fusion.update(raw, rec)
+
+    def encode():
+        encoder.encode(rec, SAMPLE_UTC)
+
+    def encode_bucket():
+        minute.peek(bucket)
+        encoder.encode_bucket(bucket, 60, SAMPLE_UTC)
+
+    def encode_batch():
+        encoder.begin_batch()
+        while encoder.add_record(rec, SAMPLE_UTC):
+            pass
+        encoder.end_batch()
+
+    results = [
+        measure("timebase.now", stamp),
+        measure("buffer add/peek/drop", buffer_cycle),
+        measure("rollup merge", rollup_cycle),
+        measure("fusion update", fuse),
+        measure("json encode", encode),
+        measure("json encode (rollup)", encode_bucket),
+        measure("json encode (bulk batch)", encode_batch),
+    ]
+
+    # Tam döngü: DHT11 her okumada 2 sn beklediği için cihazda az döngü yeterli
+    loop_cycles = 5 if ON_DEVICE else CYCLES
+    reader = main.SensorReader()
+    record = new_record()
+
+    results.append(
+        measure("sensor sample", lambda: reader.sample(record), loop_cycles)
+    )
+
+    if main.wifi is not None:
+        results.append(measure("wifi poll", main.check_wifi_connection))
+
+    if main.poster:
+        length = main.encoder.encode(record, SAMPLE_UTC)
+        results.append(
+            measure(
+                "http post (keep-alive)",
+                lambda: main.poster.post(main.encoder.buf, length),
+                loop_cycles,
+            )
+        )
+
+    results.append(
+        measure(
+            "main loop cycle",
+            lambda: main.run_cycle(reader, record),
+            loop_cycles,
+        )
+    )
+
+    encode()
+    print(f"   Payload: {bytes(encoder.buf[: encoder.len]).decode()}")
+    print("✅ Zero-allocation steady state" if all(results) else "❌ Allocations found")
+
+
+run()
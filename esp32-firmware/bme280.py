@@ -7,6 +7,14 @@ from ustruct import unpack
 # BME280 varsayılan adres
 BME280_I2C_ADDR = 0x76
 
+# Nem çarpımının (a * b) doğrudan hesaplandığı üst sınır (small int içinde)
+HUMIDITY_PRODUCT_MAX = (1 << 29) - 1
+
+
+def _mul_shift(a, b, n):
+    """(a * b) >> n, a'yı bölerek: ara çarpımlar small int sınırında kalır"""
+    return (a >> n) * b + (((a & ((1 << n) - 1)) * b) >> n)
+
 
 class BME280:
     def __init__(self, mode=3, i2c=None, address=BME280_I2C_ADDR):
@@ -15,6 +23,7 @@ class BME280:
 
         # Chip ID kontrolü
         chip_id = self.i2c.readfrom_mem(self.address, 0xD0, 1)[0]
+        self.chip_id = chip_id
         if chip_id == 0x60:
             print(f"  └─ Chip ID: 0x60 (BME280 doğrulandı)")
         elif chip_id == 0x58:
@@ -34,6 +43,11 @@ class BME280:
 
         self.t_fine = 0
 
+        # measure() için sabit okuma tamponu
+        self._raw = bytearray(8)
+        self.raw_temp = 0
+        self.raw_hum = 0
+
     def _read_calibration(self):
         """Kalibrasyon verilerini oku"""
         try:
@@ -80,11 +94,10 @@ class BME280:
         return temp_raw, pressure_raw, humidity_raw
 
     def compensate_temperature(self, raw):
-        """Sıcaklık kompanzasyonu"""
-        var1 = ((raw >> 3) - (self.dig_T1 << 1)) * (self.dig_T2 >> 11)
-        var2 = (((raw >> 4) - self.dig_T1) * ((raw >> 4) - self.dig_T1) >> 12) * (
-            self.dig_T3 >> 14
-        )
+        """Sıcaklık kompanzasyonu (Bosch 32 bit tam sayı formülü)"""
+        var1 = _mul_shift((raw >> 3) - (self.dig_T1 << 1), self.dig_T2, 11)
+        d = (raw >> 4) - self.dig_T1
+        var2 = _mul_shift(_mul_shift(d, d, 12), self.dig_T3, 14)
         self.t_fine = var1 + var2
         return (self.t_fine * 5 + 128) >> 8
 
@@ -108,28 +121,36 @@ class BME280:
         return p
 
     def compensate_humidity(self, raw):
-        """Nem kompanzasyonu"""
+        """
+        Nem kompanzasyonu (% x 1024, Bosch 32 bit tam sayı formülü)
+        Ara değerler parçalara bölünür: MicroPython'da small int sınırı (2^30)
+        aşılmaz, ölçüm başına bigint tahsisi yapılmaz
+        """
         h = self.t_fine - 76800
-        h = (
-            (((raw << 14) - (self.dig_H4 << 20) - (self.dig_H5 * h)) + 16384) >> 15
-        ) * (
-            (
-                (
-                    (
-                        (
-                            ((h * self.dig_H6) >> 10)
-                            * (((h * self.dig_H3) >> 11) + 32768)
-                        )
-                        >> 10
-                    )
-                    + 2097152
-                )
-                * self.dig_H2
-                + 8192
-            )
-            >> 14
+
+        # ((raw << 14) - (H4 << 20) - H5 * h + 16384) >> 15
+        m = raw - (self.dig_H4 << 6) + 1
+        a = (
+            (m >> 1)
+            - (h >> 15) * self.dig_H5
+            + ((((m & 1) << 14) - (h & 0x7FFF) * self.dig_H5) >> 15)
         )
-        h = h - (((((h >> 15) * (h >> 15)) >> 7) * self.dig_H1) >> 4)
+
+        # ((((h * H6 >> 10) * ((h * H3 >> 11) + 32768)) >> 10) + 2097152) * H2 + 8192) >> 14
+        u = (h * self.dig_H6) >> 10
+        v = ((h * self.dig_H3) >> 11) + 32768
+        w = _mul_shift(u, v, 10) + 2097152
+        b = (w >> 14) * self.dig_H2 + (((w & 0x3FFF) * self.dig_H2 + 8192) >> 14)
+
+        # h = a * b, sonuç [0, 419430400] aralığına kırpılır; 2^29 üzerindeki
+        # çarpımlar düzeltme sonrasında da üst sınırın üstünde kalır
+        if a == 0 or b == 0 or (a < 0) != (b < 0):
+            return 0
+        if abs(a) > HUMIDITY_PRODUCT_MAX // abs(b):
+            return 419430400 >> 12
+        h = a * b
+
+        h -= ((((h >> 15) * (h >> 15)) >> 7) * self.dig_H1) >> 4
         h = 0 if h < 0 else h
         h = 419430400 if h > 419430400 else h
         return h >> 12
@@ -166,3 +187,31 @@ class BME280:
         """Sadece nem"""
         _, _, hum_raw = self.read_raw_data()
         return self.compensate_humidity(hum_raw) / 1024
+
+    def measure(self):
+        """Ham veriyi sabit tampona oku (heap tahsisi yapmaz, basınç atlanır)"""
+        self.i2c.readfrom_mem_into(self.address, 0xF7, self._raw)
+        data = self._raw
+        self.raw_temp = (data[3] << 12) | (data[4] << 4) | (data[5] >> 4)
+        self.raw_hum = (data[6] << 8) | data[7]
+
+    def temperature_centi(self):
+        """Son measure() sonucundan sıcaklık (°C x 100, tam sayı)"""
+        return self.compensate_temperature(self.raw_temp)
+
+    def humidity_centi(self):
+        """Son measure() sonucundan nem (% x 100); önce temperature_centi() çağrılmalı"""
+        return (self.compensate_humidity(self.raw_hum) * 100) >> 10
+
+    def read_into(self, raw, offset):
+        """Ortak sensör arayüzü: sıcaklık (ve BME280 ise nem) değerlerini raw'a yaz"""
+        self.measure()
+        # Nem kompanzasyonu t_fine'a bağlı, önce sıcaklık hesaplanmalı
+        raw[offset] = self.temperature_centi()
+        if self.chip_id == 0x60:
+            raw[offset + 1] = self.humidity_centi()
+
+
+def create(i2c, address):
+    """Sürücü kaydı (sensors.py) için fabrika fonksiyonu"""
+    return BME280(i2c=i2c, address=address)
@@ -4,6 +4,7 @@ import time
 
 import esp
 import network
+from timebase import clock
 
 # Import WiFi configuration
 try:
@@ -24,6 +25,11 @@ except ImportError:
     WIFI_RETRY_ATTEMPTS = 3
     NTP_SERVER = "pool.ntp.org"
 
+try:
+    from config import WIFI_BACKOFF_MAX
+except ImportError:
+    WIFI_BACKOFF_MAX = 300
+
 # Debug mesajlarını kapat
 esp.osdebug(None)
 
@@ -34,111 +40,199 @@ print("\n" + "=" * 50)
 print("ESP32 Başlatıldı - MicroPython")
 print("=" * 50)
 
-# Global WLAN nesnesi
-wlan = None
+# WiFi supervisor durumları
+WIFI_IDLE = 0
+WIFI_CONNECTING = 1
+WIFI_CONNECTED = 2
+WIFI_BACKOFF = 3
 
+WIFI_STATE_NAMES = ("idle", "connecting", "connected", "backoff")
 
-def sync_time_with_ntp():
-    """NTP sunucusu ile saat senkronizasyonu"""
-    try:
-        import ntptime
-
-        print(f"🕒 NTP senkronizasyonu yapılıyor ({NTP_SERVER})...")
-        ntptime.host = NTP_SERVER
-        ntptime.settime()
-        print("✓ NTP senkronizasyonu başarılı")
-
-        # Şu anki zamanı göster
-        import time
-
-        t = time.localtime()
-        print(
-            f"   Tarih/Saat: {t[0]:04d}-{t[1]:02d}-{t[2]:02d} {t[3]:02d}:{t[4]:02d}:{t[5]:02d}"
-        )
-        return True
-    except ImportError:
-        print("⚠️  ntptime modülü bulunamadı")
-        return False
-    except Exception as e:
-        print(f"⚠️  NTP senkronizasyonu başarısız: {e}")
-        print("   Timestamp backend tarafından atanacak")
-        return False
-
-
-def connect_wifi():
-    """WiFi bağlantısını başlat"""
-    global wlan
-
-    if not WIFI_SSID or not WIFI_PASSWORD:
-        print("❌ WiFi credentials not configured!")
-        return False
-
-    # Global WLAN nesnesini oluştur (sadece bir kez)
-    if wlan is None:
-        wlan = network.WLAN(network.STA_IF)
-        wlan.active(True)
-
-    if wlan.isconnected():
-        print("✓ Already connected to WiFi")
-        print(f"   IP: {wlan.ifconfig()[0]}")
-        return True
-
-    print(f"📡 Connecting to WiFi: {WIFI_SSID}")
+# RSSI okuma aralığı (ms) - her poll'da sürücüyü sorgulamamak için
+RSSI_INTERVAL_MS = 10000
 
-    try:
-        wlan.connect(WIFI_SSID, WIFI_PASSWORD)
 
-        # Wait for connection
-        start_time = time.time()
-        while not wlan.isconnected():
-            if time.time() - start_time > WIFI_TIMEOUT:
+def sync_time_with_ntp():
+    """NTP isteğini başlat (beklemez); gönderim ve cevap clock.poll() ile boş zamanda işlenir"""
+    print(f"🕒 NTP senkronizasyonu başlatıldı ({NTP_SERVER})...")
+    clock.request(NTP_SERVER)
+
+
+class WifiSupervisor:
+    """
+    Poll tabanlı WiFi durum makinesi (idle → connecting → connected / backoff)
+    poll() asla bloklamaz; ana döngü her turda çağırır ve is_online() ile sorgular
+    """
+
+    def __init__(self, ssid, password, timeout=10, backoff_base=2, backoff_max=300):
+        self.ssid = ssid
+        self.password = password
+        self.timeout_ms = int(timeout * 1000)
+        self.backoff_base_ms = int(backoff_base * 1000)
+        self.backoff_max_ms = int(backoff_max * 1000)
+
+        self.wlan = None
+        self.state = WIFI_IDLE
+        self.failures = 0
+        self.connect_count = 0
+        self.rssi = None
+
+        self._deadline = 0
+        self._rssi_at = 0
+
+    def is_configured(self):
+        """WiFi bilgileri girilmiş mi?"""
+        return bool(self.ssid and self.password)
+
+    def is_online(self):
+        """Anlık bağlantı durumu (sürücüyü sorgulamaz, son poll sonucunu döner)"""
+        return self.state == WIFI_CONNECTED
+
+    def state_name(self):
+        """Durum adı (log için)"""
+        return WIFI_STATE_NAMES[self.state]
+
+    def poll(self):
+        """Durum makinesini bir adım ilerlet ve online durumunu dön"""
+        if not self.is_configured():
+            return False
+
+        now = time.ticks_ms()
+
+        if self.state == WIFI_IDLE:
+            self._start_connect(now)
+
+        elif self.state == WIFI_CONNECTING:
+            if self.wlan.isconnected():
+                self._on_connected(now)
+            elif time.ticks_diff(now, self._deadline) >= 0:
                 print("⏰ WiFi connection timeout!")
+                self._enter_backoff(now)
+
+        elif self.state == WIFI_CONNECTED:
+            if not self.wlan.isconnected():
+                # İlk yeniden bağlanma denemesi beklemesiz yapılır
+                print("⚠️  WiFi connection lost! Reconnecting in background...")
+                self.rssi = None
+                self._start_connect(now)
+            elif clock.due():
+                # Periyodik yeniden senkronizasyon (drift tahmini için)
+                sync_time_with_ntp()
+            elif time.ticks_diff(now, self._rssi_at) >= RSSI_INTERVAL_MS:
+                self._update_rssi(now)
+
+        elif self.state == WIFI_BACKOFF:
+            if self.wlan.isconnected():
+                # Sürücü kendi kendine bağlandıysa beklemeye gerek yok
+                self._on_connected(now)
+            elif time.ticks_diff(now, self._deadline) >= 0:
+                self._start_connect(now)
+
+        return self.state == WIFI_CONNECTED
+
+    def wait_online(self, timeout):
+        """
+        Sadece boot sırasında: en fazla timeout saniye bağlantıyı bekle,
+        bağlanınca ilk NTP cevabını da (en fazla NTP zaman aşımı kadar) bekle
+        """
+        deadline = time.ticks_add(time.ticks_ms(), int(timeout * 1000))
+        while not self.poll():
+            if time.ticks_diff(time.ticks_ms(), deadline) >= 0:
                 return False
-            print(".", end="")
-            time.sleep(0.5)
-
-        print("\n✅ WiFi connected!")
-        print(f"   IP Address: {wlan.ifconfig()[0]}")
-        print(f"   Subnet Mask: {wlan.ifconfig()[1]}")
-        print(f"   Gateway: {wlan.ifconfig()[2]}")
-        print(f"   DNS: {wlan.ifconfig()[3]}")
-        return True
+            time.sleep_ms(100)
 
-    except Exception as e:
-        print(f"\n❌ WiFi connection error: {e}")
-        return False
+        while clock.waiting():
+            clock.poll()
+            time.sleep_ms(10)
+        return True
 
+    def _start_connect(self, now):
+        """Bağlantı isteğini başlat (beklemeden döner)"""
+        if self.wlan is None:
+            self.wlan = network.WLAN(network.STA_IF)
+            self.wlan.active(True)
+
+        if self.wlan.isconnected():
+            self._on_connected(now)
+            return
+
+        print(f"📡 Connecting to WiFi: {self.ssid}")
+        try:
+            # Yarım kalmış bağlantı denemesi varsa iptal et
+            if self.state != WIFI_IDLE:
+                self.wlan.disconnect()
+            self.wlan.connect(self.ssid, self.password)
+        except Exception as e:
+            print(f"❌ WiFi connection error: {e}")
+            self._enter_backoff(now)
+            return
+
+        self.state = WIFI_CONNECTING
+        self._deadline = time.ticks_add(now, self.timeout_ms)
+
+    def _enter_backoff(self, now):
+        """Başarısız denemeden sonra artan bekleme süresine geç"""
+        self.failures += 1
+        delay = self.backoff_base_ms << min(self.failures - 1, 16)
+        if delay > self.backoff_max_ms:
+            delay = self.backoff_max_ms
+
+        self.state = WIFI_BACKOFF
+        self._deadline = time.ticks_add(now, delay)
+        print(f"⏳ WiFi retry #{self.failures} in {delay // 1000} seconds...")
+
+    def _on_connected(self, now):
+        """Bağlantı kuruldu: sayaçları sıfırla, RSSI ölç, NTP'yi yeniden senkronize et"""
+        self.state = WIFI_CONNECTED
+        self.failures = 0
+        self.connect_count += 1
+        self._update_rssi(now)
+
+        ifconfig = self.wlan.ifconfig()
+        print("✅ WiFi connected!")
+        print(f"   IP Address: {ifconfig[0]}")
+        print(f"   Gateway: {ifconfig[2]}")
+        if self.rssi is not None:
+            print(f"   RSSI: {self.rssi} dBm")
+
+        # Her (yeniden) bağlantıda saat sapmasını düzelt
+        if not clock.waiting():
+            sync_time_with_ntp()
 
-def connect_wifi_with_retry():
-    """WiFi bağlantısını retry mekanizması ile başlat"""
-    for attempt in range(WIFI_RETRY_ATTEMPTS):
-        print(f"\n🔄 WiFi connection attempt {attempt + 1}/{WIFI_RETRY_ATTEMPTS}")
+    def _update_rssi(self, now):
+        """Sinyal gücünü oku (dBm)"""
+        self._rssi_at = now
+        try:
+            self.rssi = self.wlan.status("rssi")
+        except Exception:
+            self.rssi = None
 
-        if connect_wifi():
-            # WiFi başarılı, NTP senkronizasyonu yap
-            sync_time_with_ntp()
-            return True
 
-        if attempt < WIFI_RETRY_ATTEMPTS - 1:
-            print(f"⏳ Retrying in {WIFI_RETRY_DELAY} seconds...")
-            time.sleep(WIFI_RETRY_DELAY)
+# Global WiFi supervisor
+wifi = WifiSupervisor(
+    WIFI_SSID,
+    WIFI_PASSWORD,
+    timeout=WIFI_TIMEOUT,
+    backoff_base=WIFI_RETRY_DELAY,
+    backoff_max=WIFI_BACKOFF_MAX,
+)
 
-    print("❌ WiFi connection failed after all attempts")
-    return False
 
+def connect_wifi_with_retry():
+    """Boot sırasında sınırlı süre bağlantıyı bekle (sonrası arka planda devam eder)"""
+    boot_wait = WIFI_TIMEOUT * WIFI_RETRY_ATTEMPTS
+    print(f"\n🔄 Waiting up to {boot_wait} seconds for WiFi...")
 
-def check_wifi_connection():
-    """WiFi bağlantısını kontrol et ve gerekirse yeniden bağlan"""
-    global wlan
+    if wifi.wait_online(boot_wait):
+        return True
 
-    if wlan is None:
-        return connect_wifi()
+    print("⚠️  WiFi not ready at boot, supervisor will keep retrying in background")
+    return False
 
-    if not wlan.isconnected():
-        print("⚠️  WiFi connection lost! Attempting to reconnect...")
-        return connect_wifi()
 
-    return True
+def check_wifi_connection():
+    """WiFi durumunu bloklamadan kontrol et (supervisor'ı bir adım ilerletir)"""
+    return wifi.poll()
 
 
 # WiFi bağlantısını başlat (retry ile)
@@ -30,11 +30,34 @@ RETRY_DELAY = 2  # Tekrar denemeler arası bekleme süresi (saniye)
 BUFFER_MAX_SIZE = 50  # Maksimum tamponlanacak veri sayısı (~5 KB RAM)
 # Not: 50 veri = 50 * 5 saniye = ~4 dakikalık offline veri
 
+# Kademeli geçmiş: buffer dolunca eski veriler kaybolmaz, min/max/ortalama kovalarına toplanır
+HISTORY_MINUTE_BUCKETS = 60  # 1 dakikalık kova sayısı (~60 dakika, ~4.3 KB RAM)
+HISTORY_QUARTER_BUCKETS = 48  # 15 dakikalık kova sayısı (~12 saat, ~3.5 KB RAM)
+
+# Bağlantı geri geldiğinde tamponlanmış veriler /bulk uç noktasına gruplar halinde gönderilir
+UPLOAD_BATCH_SIZE = 10  # İstek başına en fazla kayıt/kova sayısı
+# Not: gönderim tamponu öğe başına ~430 bayt RAM ayırır (10 öğe ~4.3 KB)
+
+# Yerel ağ durum sunucusu (http://<ESP32-IP>/status)
+# Backend çalışmasa da aynı WiFi'daki cihazlar son ölçümü okuyabilir
+STATUS_SERVER_ENABLED = True
+STATUS_PORT = 80
+STATUS_MAX_CLIENTS = 2  # Aynı anda açık bağlantı sınırı (fazlası sırada bekler)
+
+# Steady-State Mode (uzun süreli çalışma için)
+# True: döngü başına log basılmaz, GC sadece boşta (ölçümler arasında) çalışır
+STEADY_STATE_MODE = False
+GC_IDLE_BYTES = 4096  # Son GC'den beri bu kadar heap ayrıldıysa boşta GC çalıştır
+
 # WiFi Configuration
 WIFI_TIMEOUT = 10  # WiFi bağlantı timeout süresi (saniye)
-WIFI_RETRY_ATTEMPTS = 3  # Başlangıçta WiFi bağlantı deneme sayısı
-WIFI_RETRY_DELAY = 2  # WiFi tekrar denemeler arası bekleme (saniye)
+WIFI_RETRY_ATTEMPTS = 3  # Boot'ta en fazla WIFI_TIMEOUT * WIFI_RETRY_ATTEMPTS saniye beklenir
+WIFI_RETRY_DELAY = 2  # İlk backoff süresi (saniye), her başarısız denemede ikiye katlanır
+WIFI_BACKOFF_MAX = 300  # Maksimum backoff süresi (saniye)
 
 # NTP Configuration (Otomatik saat senkronizasyonu)
 NTP_SERVER = "pool.ntp.org"  # NTP sunucusu
+NTP_RESYNC_INTERVAL = 3600  # Periyodik yeniden senkronizasyon aralığı (saniye, drift tahmini için)
 # Alternatifler: "time.google.com", "time.cloudflare.com", "tr.pool.ntp.org"
+# Sunucu adı önbelleğe alınır; DNS sorgusu zaman aşımsız bloklar, internetsiz WiFi'da
+# örneklemeyi hiç bekletmemek için IP adresi de yazılabilir (ör. "162.159.200.1")
@@ -0,0 +1,43 @@
+"""
+DHT11 Sıcaklık ve Nem Sensörü (MicroPython dahili dht modülü üzerine ince katman)
+"""
+
+import time
+
+import dht
+from machine import Pin
+
+
+# DHT11, iki okuma arası minimum bu kadar beklemeli (ms)
+MIN_INTERVAL_MS = 2000
+
+
+class DHT11Sensor:
+    def __init__(self, pin):
+        # Pull-up resistor aktif et (ETIMEDOUT hatasını önler)
+        self.sensor = dht.DHT11(Pin(pin, Pin.IN, Pin.PULL_UP))
+        self._last_ms = time.ticks_ms()
+
+    def read_into(self, raw, offset):
+        """Ortak sensör arayüzü: sıcaklık ve nemi raw'a yaz (x100)"""
+        # Son okumadan beri 2 sn geçmediyse sadece kalan süre kadar beklenir
+        # (örnekleme periyodu daha uzunsa döngünün boş zamanı durum sunucusuna kalır)
+        wait = MIN_INTERVAL_MS - time.ticks_diff(time.ticks_ms(), self._last_ms)
+        if wait > 0:
+            time.sleep_ms(wait)
+        try:
+            self.sensor.measure()
+        except OSError as e:
+            if "ETIMEDOUT" in str(e):
+                print("  ⚠️  Pull-up resistor (4.7kΩ) data pini ile 3.3V arası eklenmelidir")
+            raise
+        finally:
+            self._last_ms = time.ticks_ms()
+        # DHT11 tam sayı döner
+        raw[offset] = self.sensor.temperature() * 100
+        raw[offset + 1] = self.sensor.humidity() * 100
+
+
+def create(pin):
+    """Sürücü kaydı (sensors.py) için fabrika fonksiyonu"""
+    return DHT11Sensor(pin)
@@ -0,0 +1,274 @@
+"""
+Çoklu Sensör Füzyonu
+Her kayıt alanı (sıcaklık, nem, vücut sıcaklığı) için tek durumlu bir Kalman filtresi:
+aynı alanı ölçen kanallar ters-varyans ağırlığıyla birleştirilir, kanal gürültüsü
+çevrimiçi öğrenilir ve tahminden çok sapan okumalar reddedilir. Kanallar tahminden
+gürültülerinin ötesinde ayrışırsa güven düşer. Hesaplar sabit noktalı tam sayılarla
+yapılır (değer x100, varyans x10000); kararlı durumda heap tahsisi yapmaz
+"""
+
+from array import array
+
+from record import (
+    MISSING,
+    R_BODY,
+    R_BODY_CONF,
+    R_HUM,
+    R_HUM_CONF,
+    R_TEMP,
+    R_TEMP_CONF,
+    R_TS,
+)
+
+# Alan başına: (değer alanı, güven alanı, süreç gürültüsü, güven ölçeği)
+# Süreç gürültüsü: tahminin saniyede artan varyansı (centi²/s); sıcaklık ve nem
+# yavaş değişir, vücut sıcaklığı bebek hareket ettikçe hızlı değişebilir
+# Güven ölçeği: %50 güvene karşılık gelen tahmin varyansı (centi²)
+FIELDS = (
+    (R_TEMP, R_TEMP_CONF, 4, 2500),  # ±0.5°C
+    (R_HUM, R_HUM_CONF, 25, 10000),  # ±1%
+    (R_BODY, R_BODY_CONF, 25, 2500),  # ±0.5°C
+)
+
+# Aykırı değer kapısı: inovasyon² > GATE_SIGMA2 × (P + R) ise okuma reddedilir (3σ)
+GATE_SIGMA2 = 9
+
+# Bundan büyük sapmalar kareleri alınmadan reddedilir (MicroPython'da bigint önlenir)
+INNOVATION_LIMIT = 20000
+
+# En güvenilir kanal bu kadar ardışık örnekte reddedilirse sapan kanal değil tahmindir
+# (ör. sensör yer değiştirdi, gerçek bir sıçrama oldu): tahmin o kanaldan yeniden
+# başlatılır. Sayaç kanal başınadır; diğer kanalların kabul edilmesi onu sıfırlamaz
+REINIT_AFTER = 5
+
+# Tahmin ve kanal varyans sınırları (centi²), tam sayılar 2^30 altında kalır
+# Kanal gürültüsü ayrıca çözünürlüğünün kuantalama varyansıyla (çözünürlük² / 12)
+# sınırlanır: 1°C adımlı DHT11 gibi sensörlerde öğrenilen gürültü sıfıra inmez
+VARIANCE_MAX = 250000  # ±5°C
+NOISE_MIN = 25  # ±0.05
+NOISE_MAX = 250000
+QUANTIZATION_DIV = 12
+
+# Gürültü öğrenme hızı: R += (ölçülen - R) / 2^NOISE_SHIFT
+NOISE_SHIFT = 4
+
+# Kalman kazancının sabit nokta ölçeği (Q10)
+GAIN_SHIFT = 10
+
+# Kanal uyuşmazlığı (χ²/serbestlik derecesi) oranının sabit nokta ölçeği (Q4)
+CHI2_SHIFT = 4
+
+# χ² hesabında sapma bu değerle sınırlanır (centi), (y² << CHI2_SHIFT) small int kalır
+CHI2_DEVIATION_MAX = 4000
+
+# Tahmin adımında dikkate alınan en uzun süre (s)
+DT_MAX = 3600
+
+
+class FieldEstimator:
+    """
+    Tek bir alanın füzyon durumu: tahmin (x), tahmin varyansı (p) ve kanal başına
+    öğrenilmiş gürültü varyansı; örnek başına O(kanal) işlem, sabit bellek
+    """
+
+    def __init__(self, field, conf_field, process_noise, conf_variance, channels):
+        self.field = field
+        self.conf_field = conf_field
+        self.process_noise = process_noise
+        self.conf_variance = conf_variance
+
+        # channels: (raw indeksi, başlangıç gürültüsü ±centi, çözünürlük centi, etiket)
+        self.indices = array("i", [c[0] for c in channels])
+        self.noise_min = array(
+            "i", [max(NOISE_MIN, c[2] * c[2] // QUANTIZATION_DIV) for c in channels]
+        )
+        self.noise = array(
+            "i",
+            [_clamp_noise(c[1] * c[1], self.noise_min[j]) for j, c in enumerate(channels)],
+        )
+        self.labels = tuple(c[3] for c in channels)
+        self.accepted = array("i", [0] * len(channels))
+        self.rejected = array("i", [0] * len(channels))
+        self.reject_runs = array("i", [0] * len(channels))
+
+        # Bu örnekte tahminle karşılaştırılan kanallar (güven hesabı için): kabul
+        # edilenler ve reddedilen en güvenilir kanal
+        self._compared = bytearray(len(channels))
+
+        self.x = MISSING
+        self.p = VARIANCE_MAX
+        self.last_ts = 0
+
+        # Son örneğin çıktısı
+        self.value = MISSING
+        self.confidence = MISSING
+
+    def update(self, raw, ts):
+        """Kanalların bu örnekteki okumalarını (raw) tahmine kat, value/confidence'ı güncelle"""
+        x = self.x
+        p = self.p
+
+        # Tahmin adımı: son örnekten beri geçen süre kadar belirsizlik artar
+        if x != MISSING:
+            dt = ts - self.last_ts
+            if dt > DT_MAX:
+                dt = DT_MAX
+            if dt > 0:
+                p += self.process_noise * dt
+                if p > VARIANCE_MAX:
+                    p = VARIANCE_MAX
+        self.last_ts = ts
+
+        # Bu örnekte okunan en güvenilir (gürültüsü en küçük) kanal
+        best = -1
+        for j in range(len(self.indices)):
+            if raw[self.indices[j]] != MISSING and (
+                best < 0 or self.noise[j] < self.noise[best]
+            ):
+                best = j
+
+        seen = 0
+        used = 0
+        # Karşılaştırılan kanalın normalize inovasyonu y² / (P + R) (Q4); tek kanal
+        # karşılaştırıldığında χ² olarak kullanılır
+        innovation = 0
+        for j in range(len(self.indices)):
+            self._compared[j] = 0
+            z = raw[self.indices[j]]
+            if z == MISSING:
+                continue
+            seen += 1
+            r = self.noise[j]
+
+            if x == MISSING:
+                # İlk okuma tahmini başlatır
+                x = z
+                p = r
+                self._accept(j)
+                used += 1
+                continue
+
+            y = z - x
+            s = p + r
+            chi2 = _chi2(y, s)
+            if y > INNOVATION_LIMIT or y < -INNOVATION_LIMIT or y * y > GATE_SIGMA2 * s:
+                self.rejected[j] += 1
+                self.reject_runs[j] += 1
+                if j != best:
+                    # Sürekli reddedilen kanalın gürültüsü yavaşça büyür (kapı genişler,
+                    # kabul edilirse düşük ağırlıkla katılır)
+                    self.noise[j] = _clamp_noise(r + (r >> NOISE_SHIFT), self.noise_min[j])
+                    continue
+                if self.reject_runs[j] < REINIT_AFTER:
+                    # En güvenilir kanalın gürültüsü büyütülmez: yanlış olan tahmin
+                    # olabilir, bu yüzden güven hesabına katılır
+                    self._compared[j] = 1
+                    innovation = chi2
+                    continue
+
+                # Gerçek değişim: tahmin en güvenilir kanaldan yeniden başlar
+                x = z
+                p = r
+                innovation = 0
+                self._accept(j)
+                used += 1
+                continue
+
+            # Gürültü öğrenme: E[y²] = P + R → R ≈ y² - P (üstel ortalama)
+            r += (y * y - p - r) >> NOISE_SHIFT
+            self.noise[j] = _clamp_noise(r, self.noise_min[j])
+
+            # Güncelleme: K = P / (P + R), ardışık güncelleme ters-varyans ağırlığına eşdeğer
+            k = (p << GAIN_SHIFT) // s
+            x += (k * y + (1 << (GAIN_SHIFT - 1))) >> GAIN_SHIFT
+            p -= (k * p) >> GAIN_SHIFT
+            self._accept(j)
+            innovation = chi2
+            used += 1
+
+        self.x = x
+        self.p = p
+
+        # Taze okuma yoksa eski tahmin gönderilmez
+        if seen and x != MISSING:
+            self.value = x
+            if used:
+                p = self._agreement_variance(raw, x, p, innovation)
+            else:
+                # Hiçbir okuma kabul edilmedi: gönderilen eski tahmin doğrulanamıyor
+                p = VARIANCE_MAX
+            self.confidence = 100 * self.conf_variance // (self.conf_variance + p)
+        else:
+            self.value = MISSING
+            self.confidence = MISSING
+
+    def _accept(self, j):
+        """j. kanalın okuması tahmine katıldı"""
+        self.accepted[j] += 1
+        self.reject_runs[j] = 0
+        self._compared[j] = 1
+
+    def _agreement_variance(self, raw, x, p, innovation):
+        """
+        Güven için tahmin varyansı: karşılaştırılan kanallar tahminden gürültülerinin
+        beklediğinden fazla sapıyorsa (χ² / (kanal - 1) > 1) p bu oranla büyütülür
+        Tek kanalda χ² o kanalın normalize inovasyonudur (innovation)
+        """
+        compared = 0
+        chi2 = 0
+        for j in range(len(self.indices)):
+            if self._compared[j]:
+                chi2 += _chi2(raw[self.indices[j]] - x, self.noise[j])
+                compared += 1
+
+        if p <= 0:
+            return p
+
+        ratio = chi2 // (compared - 1) if compared > 1 else innovation
+        if ratio <= 1 << CHI2_SHIFT:
+            return p
+        if ratio >= (VARIANCE_MAX << CHI2_SHIFT) // p:
+            return VARIANCE_MAX
+        return (p * ratio) >> CHI2_SHIFT
+
+
+class Fusion:
+    """
+    Sensör kanallarını kayıt alanlarına birleştirir
+    channels: (kayıt alanı, raw indeksi, başlangıç gürültüsü ±centi, çözünürlük centi,
+               etiket) listesi
+    """
+
+    def __init__(self, channels):
+        estimators = []
+        for field, conf_field, process_noise, conf_variance in FIELDS:
+            sources = [c[1:] for c in channels if c[0] == field]
+            estimators.append(
+                FieldEstimator(
+                    field, conf_field, process_noise, conf_variance, sources
+                )
+            )
+        self.estimators = tuple(estimators)
+
+    def update(self, raw, rec):
+        """raw okumalarını birleştir, değer ve güven alanlarını rec içine yaz"""
+        ts = rec[R_TS]
+        for est in self.estimators:
+            est.update(raw, ts)
+            rec[est.field] = est.value
+            rec[est.conf_field] = est.confidence
+
+
+def _chi2(y, variance):
+    """y² / varyans (Q4); sapma sınırlanır, ara değer small int kalır"""
+    if y > CHI2_DEVIATION_MAX or y < -CHI2_DEVIATION_MAX:
+        y = CHI2_DEVIATION_MAX
+    return (y * y << CHI2_SHIFT) // variance
+
+
+def _clamp_noise(r, floor):
+    if r < floor:
+        return floor
+    if r > NOISE_MAX:
+        return NOISE_MAX
+    return r
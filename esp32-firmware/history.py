@@ -0,0 +1,233 @@
+"""
+Cihaz Üzeri Ölçüm Geçmişi
+WiFi kesintisinde kayıtlar sabit boyutlu RAM tamponlarında tutulur:
+son dakikalar tam çözünürlükte, daha eskileri 1 dakikalık ve 15 dakikalık
+min/max/ortalama kovalarına (bucket) artımlı olarak toplanır
+"""
+
+from array import array
+
+from record import (
+    B_COUNT,
+    B_END,
+    B_SEQ,
+    B_SEQ_LAST,
+    B_FIELDS,
+    B_INSTALL,
+    B_START,
+    B_STATS,
+    BUCKET_SIZE,
+    F_MAX,
+    F_MIN,
+    F_N,
+    F_SUM,
+    FIELD_SIZE,
+    MISSING,
+    RECORD_SIZE,
+    R_BODY,
+    R_HUM,
+    R_INSTALL,
+    R_SEQ,
+    R_TEMP,
+    R_TS,
+)
+
+# Kovaya toplanan kayıt alanları (sırası B_FIELDS ile aynı)
+_RECORD_FIELDS = (R_TEMP, R_HUM, R_BODY)
+
+
+class DataBuffer:
+    """
+    Circular buffer for offline data storage
+    WiFi kesintisinde veri kaybını önlemek için RAM-based tamponlama
+    Kayıtlar önceden ayrılmış tek bir array("i") içinde tutulur (sabit bellek)
+    Dolunca en eski kayıt kaybolmaz, rollup katmanına (varsa) toplanır
+    """
+
+    def __init__(self, max_size=50, verbose=True, rollup=None):
+        self.max_size = max_size
+        self.verbose = verbose
+        self.rollup = rollup
+        self.data = array("i", [MISSING] * (max_size * RECORD_SIZE))
+        self.head = 0  # En eski kaydın indeksi
+        self.count = 0
+
+    def add(self, rec):
+        """Kaydı kopyala (dolu ise en eski kaydın üzerine yazılır, FIFO)"""
+        if self.count < self.max_size:
+            slot = (self.head + self.count) % self.max_size
+            self.count += 1
+        else:
+            slot = self.head
+            self.head = (self.head + 1) % self.max_size
+            if self.rollup:
+                self.rollup.merge_record(self.data, slot * RECORD_SIZE)
+
+        base = slot * RECORD_SIZE
+        for i in range(RECORD_SIZE):
+            self.data[base + i] = rec[i]
+
+        if self.verbose:
+            print(f"📦 Buffer: {self.count}/{self.max_size} items")
+
+    def peek(self, rec, index=0):
+        """En eskiden itibaren index. kaydı rec'e kopyala (silmeden)"""
+        base = ((self.head + index) % self.max_size) * RECORD_SIZE
+        for i in range(RECORD_SIZE):
+            rec[i] = self.data[base + i]
+
+    def drop(self, count=1):
+        """En eski count kaydı sil"""
+        if count > self.count:
+            count = self.count
+        self.head = (self.head + count) % self.max_size
+        self.count -= count
+
+    def clear(self):
+        """Buffer'ı temizle"""
+        self.head = 0
+        self.count = 0
+
+    def is_empty(self):
+        """Buffer boş mu?"""
+        return self.count == 0
+
+    def size(self):
+        """Buffer'daki eleman sayısı"""
+        return self.count
+
+
+class RollupTier:
+    """
+    Sabit sayıda zaman kovası (min/max/toplam/adet) tutan halka tampon
+    Yeni kayıt en yeni kovanın penceresindeyse o kovaya eklenir, değilse yeni kova açılır;
+    dolunca en eski kova bir sonraki (daha kaba) katmana toplanır veya atılır
+    """
+
+    def __init__(self, width, max_size, next_tier=None):
+        self.width = width  # Kova genişliği (saniye)
+        self.max_size = max_size
+        self.next_tier = next_tier
+        self.data = array("i", [MISSING] * (max_size * BUCKET_SIZE))
+        self.head = 0
+        self.count = 0
+        self.dropped = 0  # Son katmandan atılan kova sayısı
+        self.sealed = False  # En yeni kova gönderildi, içeriği artık değişmez
+
+    def merge_record(self, src, base):
+        """src[base:] konumundaki ham kaydı ilgili kovaya ekle"""
+        ts = src[base + R_TS]
+        b = self._bucket_for(ts, src[base + R_INSTALL], src[base + R_SEQ])
+        data = self.data
+
+        data[b + B_COUNT] += 1
+        data[b + B_END] = ts
+        data[b + B_SEQ_LAST] = src[base + R_SEQ]
+        for k in range(B_FIELDS):
+            value = src[base + _RECORD_FIELDS[k]]
+            if value != MISSING:
+                f = b + B_STATS + k * FIELD_SIZE
+                self._merge_field(f, value, value, value, 1)
+
+    def merge_bucket(self, src, base):
+        """src[base:] konumundaki (daha ince) kovayı ilgili kovaya ekle"""
+        b = self._bucket_for(
+            src[base + B_START], src[base + B_INSTALL], src[base + B_SEQ]
+        )
+        data = self.data
+
+        data[b + B_COUNT] += src[base + B_COUNT]
+        data[b + B_END] = src[base + B_END]
+        data[b + B_SEQ_LAST] = src[base + B_SEQ_LAST]
+        for k in range(B_FIELDS):
+            f = base + B_STATS + k * FIELD_SIZE
+            if src[f + F_N]:
+                self._merge_field(
+                    b + B_STATS + k * FIELD_SIZE,
+                    src[f + F_MIN],
+                    src[f + F_MAX],
+                    src[f + F_SUM],
+                    src[f + F_N],
+                )
+
+    def peek(self, bucket, index=0):
+        """En eskiden itibaren index. kovayı bucket'a kopyala (silmeden)"""
+        base = ((self.head + index) % self.max_size) * BUCKET_SIZE
+        for i in range(BUCKET_SIZE):
+            bucket[i] = self.data[base + i]
+
+    def drop(self, count=1):
+        """En eski count kovayı sil"""
+        if count > self.count:
+            count = self.count
+        self.head = (self.head + count) % self.max_size
+        self.count -= count
+
+    def seal(self):
+        """
+        En yeni kovayı kapat: sonraki kayıtlar aynı pencerede de yeni kovaya eklenir
+        Gönderilen kova cevabı kaybolursa aynı içerikle tekrar gönderilmeli; backend
+        tekrarı (installId, resolution, seq) ile ayıklar, sonradan eklenenler kaybolurdu
+        """
+        self.sealed = True
+
+    def is_empty(self):
+        """Katman boş mu?"""
+        return self.count == 0
+
+    def size(self):
+        """Katmandaki kova sayısı"""
+        return self.count
+
+    def _bucket_for(self, ts, install_id, seq):
+        """
+        ts'yi içeren kovanın başlangıç indeksini dön (gerekirse seq ile yeni kova aç)
+        Kurulum kimliği değiştiyse veya en yeni kova gönderildiyse (seal) aynı
+        pencerede de yeni kova açılır: kovanın anahtarı tek bir (installId, seq) olmalı
+        """
+        if self.count and not self.sealed:
+            newest = ((self.head + self.count - 1) % self.max_size) * BUCKET_SIZE
+            if (
+                self.data[newest + B_START] // self.width == ts // self.width
+                and self.data[newest + B_INSTALL] == install_id
+            ):
+                return newest
+
+        if self.count < self.max_size:
+            slot = (self.head + self.count) % self.max_size
+            self.count += 1
+        else:
+            # Dolu: en eski kovayı bir sonraki katmana devret
+            slot = self.head
+            self.head = (self.head + 1) % self.max_size
+            if self.next_tier:
+                self.next_tier.merge_bucket(self.data, slot * BUCKET_SIZE)
+            else:
+                self.dropped += 1
+
+        self.sealed = False
+        b = slot * BUCKET_SIZE
+        data = self.data
+        data[b + B_START] = ts
+        data[b + B_END] = ts
+        data[b + B_COUNT] = 0
+        data[b + B_SEQ] = seq
+        data[b + B_SEQ_LAST] = seq
+        data[b + B_INSTALL] = install_id
+        for k in range(B_FIELDS):
+            f = b + B_STATS + k * FIELD_SIZE
+            data[f + F_MIN] = MISSING
+            data[f + F_MAX] = MISSING
+            data[f + F_SUM] = 0
+            data[f + F_N] = 0
+        return b
+
+    def _merge_field(self, f, vmin, vmax, vsum, n):
+        """Tek bir alanın istatistiklerini güncelle"""
+        data = self.data
+        if data[f + F_N] == 0 or vmin < data[f + F_MIN]:
+            data[f + F_MIN] = vmin
+        if data[f + F_N] == 0 or vmax > data[f + F_MAX]:
+            data[f + F_MAX] = vmax
+        data[f + F_SUM] += vsum
+        data[f + F_N] += n
@@ -1,19 +1,47 @@
 """
 ESP32 Çoklu Sensör Okuma Projesi
-DHT11, MLX90614 ve BME280 sensörlerinden veri okuma
+Kayıtlı sürücülerden (sensors.py: DHT11, MLX90614, BME280...) veri okuma
 Backend'e HTTP POST ile veri gönderme
 """
 
+import gc
+import json
 import time
+from array import array
 
-import bme280
-import dht
-import mlx90614
+import sensors
+from fusion import Fusion
+from history import DataBuffer, RollupTier
 from machine import I2C, Pin
+from record import (
+    B_SEQ_LAST,
+    B_START,
+    MISSING,
+    R_BODY,
+    R_BODY_CONF,
+    R_HUM,
+    R_HUM_CONF,
+    R_INSTALL,
+    R_SEQ,
+    R_TEMP,
+    R_TEMP_CONF,
+    R_TS,
+    JsonEncoder,
+    batch_bytes,
+    centi_str,
+    copy_record,
+    has_values,
+    new_bucket,
+    new_record,
+)
+from sequence import SequenceCounter
+from status import StatusServer
+from timebase import NTP_TIMEOUT_MS, clock
+from uplink import HttpPoster
 
 # Import configuration
 try:
-    from boot import check_wifi_connection
+    from boot import check_wifi_connection, wifi
     from config import (
         API_ENDPOINT,
         API_SERVER_URL,
@@ -33,84 +61,70 @@ except ImportError:
     RETRY_DELAY = 2
     BUFFER_MAX_SIZE = 50
 
+    wifi = None
+
     def check_wifi_connection():
         return False
 
 
-# Import urequests for HTTP client
 try:
-    import urequests
+    from config import GC_IDLE_BYTES, STEADY_STATE_MODE
 except ImportError:
-    print("⚠️  urequests not found! Install it with: upip.install('urequests')")
-    urequests = None
+    STEADY_STATE_MODE = False
+    GC_IDLE_BYTES = 4096
 
-# Pin tanımlamaları (30 pinli ESP32 DevKit için)
-DHT_PIN = 4  # DHT11 → D4 pinine
-I2C_SDA = 21  # BME280 ve MLX90614 SDA → D21
-I2C_SCL = 22  # BME280 ve MLX90614 SCL → D22
-
-
-class DataBuffer:
-    """
-    Circular buffer for offline data storage
-    WiFi kesintisinde veri kaybını önlemek için RAM-based tamponlama
-    """
+try:
+    from config import HISTORY_MINUTE_BUCKETS, HISTORY_QUARTER_BUCKETS
+except ImportError:
+    HISTORY_MINUTE_BUCKETS = 60
+    HISTORY_QUARTER_BUCKETS = 48
 
-    def __init__(self, max_size=50):
-        self.buffer = []
-        self.max_size = max_size
-        self.index = 0
+try:
+    from config import UPLOAD_BATCH_SIZE
+except ImportError:
+    UPLOAD_BATCH_SIZE = 10
 
-    def add(self, data):
-        """Veri ekle (circular buffer mantığı)"""
-        if len(self.buffer) < self.max_size:
-            self.buffer.append(data)
-        else:
-            # Buffer dolu, en eski veriyi üzerine yaz (FIFO)
-            self.buffer[self.index % self.max_size] = data
-            self.index += 1
+try:
+    from config import STATUS_MAX_CLIENTS, STATUS_PORT, STATUS_SERVER_ENABLED
+except ImportError:
+    STATUS_SERVER_ENABLED = True
+    STATUS_PORT = 80
+    STATUS_MAX_CLIENTS = 2
 
-        print(f"📦 Buffer: {len(self.buffer)}/{self.max_size} items")
+# Kararlı durum modunda döngü başına log basılmaz (f-string'ler heap kullanır)
+VERBOSE = not STEADY_STATE_MODE
 
-    def get_all(self):
-        """Tüm veriyi al ve temizle (FIFO sırasıyla)"""
-        data = self.buffer.copy()
-        self.clear()
-        return data
+# Bekleyen NTP cevabının boş zamanda yoklanma aralığı (ms)
+NTP_POLL_SLICE_MS = 20
 
-    def clear(self):
-        """Buffer'ı temizle"""
-        self.buffer.clear()
-        self.index = 0
+# post_encoded() sonuçları
+POST_OK = 0  # Kaydedildi (201) veya zaten kayıtlı (200)
+POST_RETRY = 1  # Ağ hatası, 5xx, 408, 429: kayıtlar saklanır, sonra tekrar denenir
+POST_REJECTED = 2  # Diğer 4xx: sunucu kaydı hiç kabul etmeyecek, tekrar denenmez
 
-    def is_empty(self):
-        """Buffer boş mu?"""
-        return len(self.buffer) == 0
+# Pin tanımlamaları (30 pinli ESP32 DevKit için)
+DHT_PIN = 4  # DHT11 → D4 pinine
+I2C_SDA = 21  # BME280 ve MLX90614 SDA → D21
+I2C_SCL = 22  # BME280 ve MLX90614 SCL → D22
 
-    def size(self):
-        """Buffer'daki eleman sayısı"""
-        return len(self.buffer)
 
+# Kademeli geçmiş: ham buffer → 1 dakikalık → 15 dakikalık kovalar (sabit bellek)
+quarter_history = RollupTier(900, HISTORY_QUARTER_BUCKETS)
+minute_history = RollupTier(60, HISTORY_MINUTE_BUCKETS, next_tier=quarter_history)
 
 # Global buffer instance
-data_buffer = DataBuffer(max_size=BUFFER_MAX_SIZE)
+data_buffer = DataBuffer(
+    max_size=BUFFER_MAX_SIZE, verbose=VERBOSE, rollup=minute_history
+)
 
 
 class SensorReader:
     def __init__(self):
-        """Sensörleri başlat"""
+        """I2C bus'ı tara ve bulunan sensörlerin sürücülerini başlat"""
         print("Sensörler başlatılıyor...")
 
-        # DHT11 başlat
-        try:
-            # Pull-up resistor aktif et (ETIMEDOUT hatasını önler)
-            self.dht_sensor = dht.DHT11(Pin(DHT_PIN, Pin.IN, Pin.PULL_UP))
-            print("✓ DHT11 başlatıldı (pull-up aktif)")
-        except Exception as e:
-            print(f"✗ DHT11 hatası: {e}")
-            self.dht_sensor = None
-
-        # I2C bus başlat
+        devices = []
+        self.i2c = None
         try:
             self.i2c = I2C(0, scl=Pin(I2C_SCL), sda=Pin(I2C_SDA), freq=100000)
             print("✓ I2C bus başlatıldı")
@@ -118,292 +132,518 @@ class SensorReader:
             # I2C cihazlarını tara
             devices = self.i2c.scan()
             print(f"Bulunan I2C adresleri: {[hex(d) for d in devices]}")
-
-            # Debug: Her cihazı tanımla
-            if devices:
-                for addr in devices:
-                    if addr == 0x5A:
-                        print(f"  └─ 0x5A: MLX90614 (IR Sıcaklık)")
-                    elif addr == 0x76:
-                        print(f"  └─ 0x76: BME280/BMP280")
-                    elif addr == 0x77:
-                        print(f"  └─ 0x77: BME280/BMP280")
-                    else:
-                        print(f"  └─ {hex(addr)}: Bilinmeyen cihaz")
-            else:
+            if not devices:
                 print("⚠️  Hiç I2C cihaz bulunamadı - bağlantıları kontrol edin!")
-
         except Exception as e:
             print(f"✗ I2C hatası: {e}")
-            self.i2c = None
-            return
-
-        # MLX90614 başlat (adres: 0x5A)
-        try:
-            self.mlx = mlx90614.MLX90614(self.i2c)
-            print("✓ MLX90614 başlatıldı")
-        except Exception as e:
-            print(f"✗ MLX90614 hatası: {e}")
-            self.mlx = None
 
-        # BME280 başlat (adres: 0x76 veya 0x77)
-        try:
-            # Önce varsayılan adres 0x76'yı dene
-            if 0x76 in devices:
-                self.bme = bme280.BME280(i2c=self.i2c, address=0x76)
-                print("✓ BME280 başlatıldı (adres: 0x76)")
-            # Bulunamazsa 0x77'yi dene
-            elif 0x77 in devices:
-                self.bme = bme280.BME280(i2c=self.i2c, address=0x77)
-                print("✓ BME280 başlatıldı (adres: 0x77)")
-            else:
-                raise RuntimeError("BME280 I2C adresinde bulunamadı (0x76 veya 0x77)")
-        except Exception as e:
-            print(f"✗ BME280 hatası: {e}")
-            print(
-                "   Kontrol edin: SDO pini GND'ye mi bağlı (0x76) yoksa VCC'ye mi (0x77)?"
-            )
-            self.bme = None
-
-    def read_dht11(self):
-        """DHT11'den sıcaklık ve nem oku"""
-        if not self.dht_sensor:
-            return None, None
-
-        try:
-            # DHT11, iki okuma arası minimum 2 saniye beklemeli
-            time.sleep(2)
-            self.dht_sensor.measure()
-            temp = self.dht_sensor.temperature()
-            hum = self.dht_sensor.humidity()
-            return temp, hum
-        except OSError as e:
-            if "ETIMEDOUT" in str(e):
-                print(f"DHT11 okuma hatası: {e}")
-                print("  ⚠️  Pull-up resistor (4.7kΩ) GPIO4 ile 3.3V arası eklenmelidir")
-            else:
-                print(f"DHT11 okuma hatası: {e}")
-            return None, None
-        except Exception as e:
-            print(f"DHT11 okuma hatası: {e}")
-            return None, None
-
-    def read_mlx90614(self):
-        """MLX90614'den sıcaklık oku"""
-        if not self.mlx:
-            return None, None
-
-        try:
-            ambient = self.mlx.read_ambient_temp()
-            object_temp = self.mlx.read_object_temp()
-            return ambient, object_temp
-        except Exception as e:
-            print(f"MLX90614 okuma hatası: {e}")
-            return None, None
-
-    def read_bme280(self):
-        """BME280'den sıcaklık, nem ve basınç oku"""
-        if not self.bme:
-            return None, None, None
+        # Sürücüler sadece bulunan cihazlar için import edilir
+        self.sensors, channels = sensors.discover(
+            self.i2c, devices, {"DHT11": DHT_PIN}
+        )
 
-        try:
-            values = self.bme.values
-            # values tuple formatı: (temp, pressure, humidity)
-            temp = float(values[0].replace("C", ""))
-            pressure = float(values[1].replace("hPa", ""))
-            humidity = float(values[2].replace("%", ""))
-            return temp, humidity, pressure
-        except Exception as e:
-            print(f"BME280 okuma hatası: {e}")
-            return None, None, None
+        # Her döngüde yeniden kullanılan ham okuma tamponu (kanal başına bir değer, x100)
+        self.raw = array("i", [MISSING] * max(channels, 1))
+
+        # Aynı kayıt alanını ölçen kanallar füzyon ile birleştirilir
+        fused = []
+        for sensor in self.sensors:
+            for i, (label, _, field, noise, resolution) in enumerate(
+                sensor.spec.channels
+            ):
+                if field is not None:
+                    fused.append(
+                        (
+                            field,
+                            sensor.offset + i,
+                            noise,
+                            resolution,
+                            f"{sensor.label()} {label}",
+                        )
+                    )
+        self.fusion = Fusion(fused)
 
     def read_all(self):
-        """Tüm sensörlerden veri oku"""
+        """Tüm sensörlerden veri oku (sonuçlar self.raw içinde)"""
+        raw = self.raw
+        for sensor in self.sensors:
+            offset = sensor.offset
+            for i in range(len(sensor.spec.channels)):
+                raw[offset + i] = MISSING
+            try:
+                sensor.driver.read_into(raw, offset)
+                sensor.failures = 0
+                sensor.last_ok = clock.now()
+            except Exception as e:
+                for i in range(len(sensor.spec.channels)):
+                    raw[offset + i] = MISSING
+                sensor.failures += 1
+                sensor.errors += 1
+                print(f"{sensor.name} okuma hatası: {e}")
+
+        if VERBOSE:
+            self.print_readings()
+
+    def print_readings(self):
+        """Son okumaları yazdır"""
+        raw = self.raw
         print("\n" + "=" * 50)
         print("SENSÖR OKUMALARI")
         print("=" * 50)
 
-        # DHT11
-        dht_temp, dht_hum = self.read_dht11()
-        if dht_temp is not None:
-            print(f"\n📊 DHT11:")
-            print(f"  Sıcaklık: {dht_temp}°C")
-            print(f"  Nem: {dht_hum}%")
-        else:
-            print("\n📊 DHT11: Veri okunamadı")
-
-        # MLX90614
-        mlx_ambient, mlx_object = self.read_mlx90614()
-        if mlx_ambient is not None:
-            print(f"\n🌡️ MLX90614:")
-            print(f"  Ortam Sıcaklığı: {mlx_ambient:.2f}°C")
-            print(f"  Nesne Sıcaklığı: {mlx_object:.2f}°C")
-        else:
-            print("\n🌡️ MLX90614: Veri okunamadı")
-
-        # BME280
-        bme_temp, bme_hum, bme_press = self.read_bme280()
-        if bme_temp is not None:
-            print(f"\n🌤️ BME280:")
-            print(f"  Sıcaklık: {bme_temp:.2f}°C")
-            print(f"  Nem: {bme_hum:.2f}%")
-            print(f"  Basınç: {bme_press:.2f} hPa")
-        else:
-            print("\n🌤️ BME280: Veri okunamadı")
+        if not self.sensors:
+            print("\n⚠️  Hiç sensör başlatılamadı")
+
+        for sensor in self.sensors:
+            channels = sensor.spec.channels
+            offset = sensor.offset
+            if all(raw[offset + i] == MISSING for i in range(len(channels))):
+                print(f"\n📊 {sensor.label()}: Veri okunamadı")
+                continue
+            print(f"\n📊 {sensor.label()}:")
+            for i, (label, unit, _, _, _) in enumerate(channels):
+                print(f"  {label}: {centi_str(raw[offset + i])}{unit}")
 
         print("=" * 50)
 
-        return {
-            "dht11": {"temp": dht_temp, "humidity": dht_hum},
-            "mlx90614": {"ambient": mlx_ambient, "object": mlx_object},
-            "bme280": {"temp": bme_temp, "humidity": bme_hum, "pressure": bme_press},
-        }
+    def sample(self, rec):
+        """
+        Sensörleri oku ve backend alanlarını rec içine yerinde yaz
+        Geçerli en az bir değer varsa True döner
+        """
+        self.read_all()
 
-    def get_formatted_data(self):
-        """Sensör verilerini backend formatına çevir"""
-        raw_data = self.read_all()
-
-        # BME280 ve MLX90614 verilerini kullan (öncelikli)
-        # Fallback olarak DHT11 kullan
-        temperature = None
-        humidity = None
-        body_temperature = None
-
-        # Sıcaklık: BME280 > DHT11
-        if raw_data["bme280"]["temp"] is not None:
-            temperature = raw_data["bme280"]["temp"]
-        elif raw_data["dht11"]["temp"] is not None:
-            temperature = float(raw_data["dht11"]["temp"])
-
-        # Nem: DHT11 > BME280 (DHT11 öncelikli)
-        if raw_data["dht11"]["humidity"] is not None:
-            humidity = float(raw_data["dht11"]["humidity"])
-        elif raw_data["bme280"]["humidity"] is not None:
-            humidity = raw_data["bme280"]["humidity"]
-
-        # Vücut sıcaklığı: MLX90614 object temperature
-        if raw_data["mlx90614"]["object"] is not None:
-            body_temperature = raw_data["mlx90614"]["object"]
-
-        # Tüm değerler None ise None dön
-        if temperature is None and humidity is None and body_temperature is None:
-            return None
-
-        return {
-            "temperature": temperature,
-            "humidity": humidity,
-            "bodyTemperature": body_temperature,
-            "deviceId": DEVICE_ID,
-            "timestamp": self.get_iso_timestamp(),
-        }
+        rec[R_TS] = clock.now()  # Monotonik damga, UTC'ye gönderimde çevrilir
 
-    @staticmethod
-    def get_iso_timestamp():
-        """ISO 8601 formatında timestamp oluştur"""
-        # MicroPython'da gerçek tarih/saat için RTC gerekli
-        # Şimdilik basit bir timestamp kullan
-        import time
-
-        # Unix timestamp'ı ISO formatına çevir (yaklaşık)
-        # Not: ESP32'de RTC ayarlanmazsa bu değer 2000'den başlar
-        t = time.localtime()
-        return "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}Z".format(
-            t[0], t[1], t[2], t[3], t[4], t[5]
-        )
+        # Alan başına füzyon tahmini ve güveni (aykırı okumalar elenir)
+        self.fusion.update(self.raw, rec)
 
+        if not has_values(rec):
+            return False
 
-def send_to_backend(data):
+        # Sıra numarası sadece gönderilecek kayıtlara verilir
+        # (take() kurulum kimliğini değiştirebilir, kimlik sonra okunur)
+        rec[R_SEQ] = sequence.take()
+        rec[R_INSTALL] = sequence.install_id
+        return True
+
+
+# Reboot'lar arasında kalıcı sıra numarası + boot sayacı
+sequence = SequenceCounter()
+
+# Gönderim için önceden ayrılmış nesneler (her döngüde yeniden kullanılır)
+# Tampon UPLOAD_BATCH_SIZE öğenin en kötü durum boyutuna göre ayrılır (10 öğe ~4.3 KB)
+encoder = JsonEncoder(
+    DEVICE_ID, sequence.boot_epoch, batch_bytes(DEVICE_ID, UPLOAD_BATCH_SIZE)
+)
+poster = None
+bulk_endpoint = None
+if API_SERVER_URL and API_ENDPOINT:
+    poster = HttpPoster(API_SERVER_URL, API_ENDPOINT)
+    bulk_endpoint = API_ENDPOINT + "/bulk"
+    poster.add_endpoint(bulk_endpoint)
+
+# Backend'in son onayladığı sıra numarası ve reddedilip atılan kayıt sayısı
+# (durum takibi için)
+acked_seq = -1
+rejected_count = 0
+pending = new_record()
+pending_bucket = new_bucket()
+
+# Durum sunucusu için son geçerli ölçüm (istek başına sensör okunmaz)
+latest = new_record()
+status_server = None
+
+
+def send_to_backend(rec):
     """
-    Tek bir veri paketini backend'e gönder
-    Buffer mekanizması tarafından kullanılır
+    Tek bir kaydı backend'e gönder
+    Backend (deviceId, installId, resolution, seq) ile tekrarları ayıkladığı için
+    tekrar göndermek güvenlidir
+    Kayıt kaydedildiyse ya da sunucu kalıcı olarak reddettiyse (atılır) True döner;
+    False ise kayıt buffer'a alınmalı
     """
-    if not urequests:
+    if not poster:
         return False
 
-    if not API_SERVER_URL or not API_ENDPOINT:
+    # Monotonik damga gönderim anındaki NTP offset'i ve drift ile UTC'ye çevrilir
+    length = encoder.encode(rec, clock.to_utc(rec[R_TS]))
+    result = post_encoded(length, None)
+    if result == POST_RETRY:
         return False
 
-    url = API_SERVER_URL + API_ENDPOINT
-    headers = {"Content-Type": "application/json"}
-    response = None
+    if result == POST_REJECTED:
+        drop_rejected(rec[R_SEQ])
+    else:
+        mark_acked(rec[R_SEQ])
+    return True
 
-    try:
-        response = urequests.post(url, json=data, headers=headers, timeout=10)
 
-        if response.status_code == 201:
-            print("✅ Data sent successfully")
-            return True
+def post_encoded(length, endpoint):
+    """
+    encoder tamponundaki JSON'u POST et, POST_OK / POST_RETRY / POST_REJECTED dön
+    201 (yeni kayıt) ve 200 (zaten kayıtlı, tekrar) başarılı sayılır; 408 ve 429
+    dışındaki 4xx cevapları kalıcıdır (aynı gövde tekrar gönderilse de reddedilir)
+    """
+    try:
+        status = poster.post(encoder.buf, length, endpoint)
+
+        if status == 201 or status == 200:
+            if VERBOSE:
+                print("✅ Data sent successfully")
+            return POST_OK
+        elif 400 <= status < 500 and status != 408 and status != 429:
+            print(f"❌ Server rejected data: {status}")
+            return POST_REJECTED
         else:
-            print(f"❌ Server error: {response.status_code}")
-            return False
+            print(f"❌ Server error: {status}")
+            return POST_RETRY
 
     except OSError as e:
         print(f"❌ Network error: {e}")
-        return False
+        poster.close()
+        return POST_RETRY
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
+        poster.close()
+        return POST_RETRY
+
+
+def mark_acked(seq):
+    """
+    Son onaylanan sıra numarasını güncelle (kayıtlar sırayla gönderilir; kurulum
+    kimliği değişince numaralar 0'dan başladığı için en büyüğü tutulmaz)
+    """
+    global acked_seq
+    acked_seq = seq
+
+
+def drop_rejected(seq):
+    """Sunucunun kalıcı olarak reddettiği kaydı say ve logla (kayıt atılır)"""
+    global rejected_count
+    rejected_count += 1
+    print(f"  ⚠️  Record #{seq} rejected by server, dropping it")
+
+
+def backfill_rollups(tier):
+    """
+    Toplu katmanı en eski kovadan başlayarak toplu (bulk) isteklerle gönder
+    Hepsi gittiyse True dön
+    """
+    if tier.is_empty():
+        return True
+    if not poster:
         return False
-    finally:
-        if response:
-            try:
-                response.close()
-            except:
-                pass
+
+    if VERBOSE:
+        print(f"📤 Backfilling {tier.size()} x {tier.width} s rollups...")
+
+    limit = UPLOAD_BATCH_SIZE
+    while not tier.is_empty():
+        encoder.begin_batch()
+        count = 0
+        last_seq = MISSING
+        while count < tier.size() and count < limit:
+            tier.peek(pending_bucket, count)
+            utc = clock.to_utc(pending_bucket[B_START])
+            if not encoder.add_bucket(pending_bucket, tier.width, utc):
+                break
+            # pending_bucket sığmayan kovayı da tutabilir, son eklenen ayrıca saklanır
+            last_seq = pending_bucket[B_SEQ_LAST]
+            count += 1
+
+        if count == tier.size():
+            # En yeni kova da gidiyor: cevap kaybolursa aynı içerikle tekrar gönderilir
+            tier.seal()
+        result = post_encoded(encoder.end_batch(), bulk_endpoint)
+        if result == POST_RETRY:
+            print("  ⚠️  Failed to send rollups, keeping them in history")
+            return False
+
+        if result == POST_REJECTED:
+            if count > 1:
+                # Batch'te reddedilen bir kova var: tek tek göndererek bulunur
+                limit = 1
+                continue
+            drop_rejected(last_seq)
+            limit = UPLOAD_BATCH_SIZE
+        else:
+            mark_acked(last_seq)
+        tier.drop(count)
+
+    return True
+
+
+def flush_buffer():
+    """
+    Ham buffer'ı toplu (bulk) isteklerle gönder, hepsi gittiyse True dön
+    Buffer sadece onaylanmamış kayıtları tutar; onaylanan batch hemen silinir
+    """
+    if data_buffer.is_empty():
+        return True
+    if not poster:
+        return False
+
+    if VERBOSE:
+        print(f"📤 Sending {data_buffer.size()} buffered items...")
+
+    limit = UPLOAD_BATCH_SIZE
+    while not data_buffer.is_empty():
+        encoder.begin_batch()
+        count = 0
+        last_seq = MISSING
+        while count < data_buffer.size() and count < limit:
+            data_buffer.peek(pending, count)
+            if not encoder.add_record(pending, clock.to_utc(pending[R_TS])):
+                break
+            # pending sığmayan kaydı da tutabilir, son eklenen ayrıca saklanır
+            last_seq = pending[R_SEQ]
+            count += 1
+
+        result = post_encoded(encoder.end_batch(), bulk_endpoint)
+        if result == POST_RETRY:
+            # Gönderilemedi, kayıtlar buffer'da kalır
+            print("  ⚠️  Failed to send buffered data, keeping it in buffer")
+            return False
+
+        if result == POST_REJECTED:
+            if count > 1:
+                # Batch'te reddedilen bir kayıt var: tek tek göndererek bulunur
+                limit = 1
+                continue
+            drop_rejected(last_seq)
+            limit = UPLOAD_BATCH_SIZE
+        else:
+            mark_acked(last_seq)
+        data_buffer.drop(count)
+
+    return True
 
 
-def send_sensor_data_with_buffer(data):
+def flush_history():
+    """
+    Kesinti süresince biriken geçmişi kronolojik sırayla gönder:
+    önce 15 dakikalık, sonra 1 dakikalık kovalar, en son ham kayıtlar
+    Hepsi gittiyse True dön
+    """
+    return (
+        backfill_rollups(quarter_history)
+        and backfill_rollups(minute_history)
+        and flush_buffer()
+    )
+
+
+def send_sensor_data_with_buffer(rec):
     """
     Buffer destekli veri gönderme
     WiFi yoksa buffer'a ekler, WiFi varsa önce buffer'daki eski verileri gönderir
     """
     # WiFi yoksa buffer'a ekle
     if not check_wifi_connection():
-        print("⚠️  No WiFi connection, buffering data...")
-        data_buffer.add(data)
+        if VERBOSE:
+            print("⚠️  No WiFi connection, buffering data...")
+        data_buffer.add(rec)
         return False
 
-    # WiFi var, önce buffer'daki eski verileri gönder
-    if not data_buffer.is_empty():
-        print(f"📤 Sending {data_buffer.size()} buffered items...")
-        buffered_data = data_buffer.get_all()
-
-        for idx, item in enumerate(buffered_data):
-            print(f"  [{idx + 1}/{len(buffered_data)}] Sending buffered data...")
-            success = send_to_backend(item)
-
-            if not success:
-                # Gönderilemedi, geri buffer'a ekle
-                print("  ⚠️  Failed to send buffered data, re-adding to buffer")
-                data_buffer.add(item)
-                # Kalan verileri de geri ekle
-                for remaining_item in buffered_data[idx + 1 :]:
-                    data_buffer.add(remaining_item)
-                break
-
-            time.sleep(0.5)  # Rate limiting
+    # WiFi var, önce geçmişteki eski verileri gönder
+    # Saat senkronize değilse eski veriler bekletilir (yanlış zamanla kaydedilmesin)
+    # Geçmiş tamamen gönderilemediyse yeni kayıt da sıraya eklenir (seq sırası korunur)
+    if clock.synced and not flush_history():
+        data_buffer.add(rec)
+        return False
 
     # Şimdi yeni veriyi gönder
-    print(f"\n📤 Sending current data to {API_SERVER_URL + API_ENDPOINT}")
-    print(f"   Data: {data}")
-    success = send_to_backend(data)
+    if VERBOSE:
+        print(f"\n📤 Sending current data to {API_SERVER_URL + API_ENDPOINT}")
+        print(
+            f"   Data: temperature={centi_str(rec[R_TEMP])}"
+            f" ({confidence_json(rec[R_TEMP_CONF])}%)"
+            f" humidity={centi_str(rec[R_HUM])}"
+            f" ({confidence_json(rec[R_HUM_CONF])}%)"
+            f" bodyTemperature={centi_str(rec[R_BODY])}"
+            f" ({confidence_json(rec[R_BODY_CONF])}%)"
+        )
+    success = send_to_backend(rec)
 
     if not success:
         print("  ⚠️  Failed to send current data, adding to buffer")
-        data_buffer.add(data)
+        data_buffer.add(rec)
 
     return success
 
 
-def send_sensor_data(data):
+def centi_json(value):
+    """Sabit noktalı değeri JSON sayısına çevir (MISSING → null)"""
+    return None if value == MISSING else value / 100
+
+
+def confidence_json(value):
+    """Füzyon güvenini JSON'a çevir (MISSING → null)"""
+    return None if value == MISSING else value
+
+
+# Durum cevabında alan adları
+FIELD_NAMES = {R_TEMP: "temperature", R_HUM: "humidity", R_BODY: "bodyTemperature"}
+
+
+def status_json(reader):
+    """Durum sunucusunun cevabı: bellekteki son durumdan üretilir"""
+    now = clock.now()
+
+    reading = None
+    if latest[R_SEQ] != MISSING:
+        reading = {
+            "temperature": centi_json(latest[R_TEMP]),
+            "humidity": centi_json(latest[R_HUM]),
+            "bodyTemperature": centi_json(latest[R_BODY]),
+            "seq": latest[R_SEQ],
+            "confidence": {
+                "temperature": confidence_json(latest[R_TEMP_CONF]),
+                "humidity": confidence_json(latest[R_HUM_CONF]),
+                "bodyTemperature": confidence_json(latest[R_BODY_CONF]),
+            },
+            "age": now - latest[R_TS],
+            "timestamp": clock.iso_utc(latest[R_TS]),
+        }
+
+    sensor_health = []
+    for sensor in reader.sensors:
+        sensor_health.append(
+            {
+                "name": sensor.name,
+                "address": sensor.address,
+                "ok": sensor.last_ok >= 0 and sensor.failures == 0,
+                "failures": sensor.failures,
+                "errors": sensor.errors,
+                "lastOkAge": now - sensor.last_ok if sensor.last_ok >= 0 else None,
+            }
+        )
+
+    fusion = []
+    for est in reader.fusion.estimators:
+        channels = []
+        for j in range(len(est.labels)):
+            channels.append(
+                {
+                    "name": est.labels[j],
+                    "noise": est.noise[j] ** 0.5 / 100,
+                    "accepted": est.accepted[j],
+                    "rejected": est.rejected[j],
+                }
+            )
+        fusion.append(
+            {
+                "field": FIELD_NAMES[est.field],
+                "estimate": centi_json(est.x),
+                "std": est.p**0.5 / 100 if est.x != MISSING else None,
+                "channels": channels,
+            }
+        )
+
+    return json.dumps(
+        {
+            "deviceId": DEVICE_ID,
+            "uptime": now,
+            "time": clock.iso_utc(now),
+            "latest": reading,
+            "buffer": {
+                "raw": data_buffer.size(),
+                "rawMax": data_buffer.max_size,
+                "minute": minute_history.size(),
+                "quarter": quarter_history.size(),
+                "dropped": quarter_history.dropped,
+            },
+            "sensors": sensor_health,
+            "fusion": fusion,
+            "wifi": {
+                "state": wifi.state_name() if wifi else "unconfigured",
+                "rssi": wifi.rssi if wifi else None,
+            },
+            "uplink": {
+                "installId": sequence.install_id,
+                "ackedSeq": acked_seq,
+                "rejected": rejected_count,
+                "lastStatus": poster.status if poster else None,
+            },
+            "memFree": gc.mem_free(),
+        }
+    )
+
+
+def run_cycle(reader, rec):
+    """Döngünün bir turu (bekleme hariç): WiFi, ölçüm ve gönderim"""
+    # WiFi supervisor'ı ilerlet (bloklamaz)
+    check_wifi_connection()
+
+    # Sensör verilerini oku, kaydı yerinde güncelle
+    if reader.sample(rec):
+        # Durum sunucusu için son ölçümü sakla
+        copy_record(latest, rec)
+
+        # Buffer destekli gönderim
+        send_sensor_data_with_buffer(rec)
+    else:
+        print("⚠️  No valid sensor data to send")
+
+
+def idle_until(deadline):
+    """
+    Döngü sonundaki boş zamanı kullan
+    Kararlı durum modunda GC burada (ölçüm sırasında değil) tetiklenir;
+    kalan süre durum sunucusuna verilir (yoksa uyunur)
+    Bir sonraki periyodun referans zamanını döner
+    """
+    global gc_mark
+
+    if STEADY_STATE_MODE and gc.mem_alloc() - gc_mark >= GC_IDLE_BYTES:
+        gc.collect()
+        gc_mark = gc.mem_alloc()
+
+    now = time.ticks_ms()
+    remaining = time.ticks_diff(deadline, now)
+    if remaining <= 0:
+        # Periyot aşıldı (ör. uzun buffer gönderimi), birikmiş gecikmeyi telafi etme
+        return now
+
+    # Bekleyen NTP isteği kısa dilimlerle yoklanır (gidiş-dönüş süresi bu hassasiyette)
+    while clock.waiting() and remaining > NTP_POLL_SLICE_MS:
+        if clock.queued() and remaining < NTP_TIMEOUT_MS:
+            # Cevap bu boş zamanda beklenemez (geç okunursa reddedilir): istek
+            # bir sonraki periyotta gönderilir
+            break
+        clock.poll()
+        wait(NTP_POLL_SLICE_MS)
+        remaining = time.ticks_diff(deadline, time.ticks_ms())
+
+    if remaining > 0:
+        wait(remaining)
+    return deadline
+
+
+def wait(ms):
+    """ms boyunca bekle; durum sunucusu varsa bu sürede istekleri işler"""
+    if status_server:
+        status_server.serve(ms)
+    else:
+        time.sleep_ms(ms)
+
+
+# Son GC sonrası ayrılmış heap miktarı (idle_until için)
+gc_mark = 0
+
+
+def send_sensor_data(rec):
     """
     DEPRECATED: Eski fonksiyon, geriye dönük uyumluluk için bırakıldı
     Artık send_sensor_data_with_buffer() kullanılmalı
     """
-    return send_sensor_data_with_buffer(data)
+    return send_sensor_data_with_buffer(rec)
 
 
 # Ana program
 def main():
+    global gc_mark, status_server
+
     print("\n🚀 ESP32 Çoklu Sensör Projesi")
     print("Başlatılıyor...\n")
 
@@ -416,22 +656,41 @@ def main():
 
     # Sensör okuyucuyu başlat
     reader = SensorReader()
+    record = new_record()
+
+    # Yerel ağ durum sunucusu (backend'den bağımsız, aynı WiFi'dan okunabilir)
+    if STATUS_SERVER_ENABLED:
+        try:
+            server = StatusServer(
+                lambda: status_json(reader), STATUS_PORT, STATUS_MAX_CLIENTS
+            )
+            server.start()
+            status_server = server
+        except Exception as e:
+            print(f"✗ Status server hatası: {e}")
+
+    if STEADY_STATE_MODE:
+        # Başlangıç çöpünü topla, otomatik GC'yi seyrekleştir (idle GC asıl işi yapar)
+        # gc.threshold() bir sonraki otomatik GC'ye kadar ayrılacak bayt miktarını alır
+        gc.collect()
+        threshold = gc.mem_free() // 4
+        gc.threshold(threshold)
+        gc_mark = gc.mem_alloc()
+        print(f"🧹 Steady-state mode: GC threshold {threshold} bytes")
 
     print(f"\nOkumalar başlıyor (Her {SEND_INTERVAL} saniyede bir)...")
     print("Durdurmak için Ctrl+C basın\n")
 
+    period_ms = SEND_INTERVAL * 1000
+    deadline = time.ticks_ms()
+
     try:
         while True:
-            # Sensör verilerini oku ve formatla
-            data = reader.get_formatted_data()
-
-            if data:
-                # Buffer destekli gönderim
-                send_sensor_data_with_buffer(data)
-            else:
-                print("⚠️  No valid sensor data to send")
+            # Sabit periyot: iş süresi bekleme süresinden düşülür
+            deadline = time.ticks_add(deadline, period_ms)
 
-            time.sleep(SEND_INTERVAL)
+            run_cycle(reader, record)
+            deadline = idle_until(deadline)
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Program durduruldu.")
@@ -440,6 +699,11 @@ def main():
             print(
                 f"📦 {data_buffer.size()} items in buffer (will be lost on power off)"
             )
+        if not minute_history.is_empty() or not quarter_history.is_empty():
+            print(
+                f"📦 {minute_history.size()} minute + {quarter_history.size()}"
+                " quarter-hour rollups in history"
+            )
     except Exception as e:
         print(f"\n\n❌ Critical error: {e}")
         import sys
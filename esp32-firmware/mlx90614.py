@@ -7,6 +7,7 @@ class MLX90614:
     def __init__(self, i2c, addr=0x5A):
         self.i2c = i2c
         self.addr = addr
+        self._buf = bytearray(2)
 
     def read_reg(self, reg):
         """Register oku"""
@@ -22,3 +23,27 @@ class MLX90614:
         """Nesne sıcaklığını oku (°C)"""
         raw = self.read_reg(0x07)
         return (raw * 0.02) - 273.15
+
+    def read_reg_into(self, reg):
+        """Register'ı önceden ayrılmış tampona oku (heap tahsisi yapmaz)"""
+        self.i2c.readfrom_mem_into(self.addr, reg, self._buf)
+        return self._buf[0] | (self._buf[1] << 8)
+
+    def read_ambient_centi(self):
+        """Ortam sıcaklığı (°C x 100, tam sayı)"""
+        # raw * 0.02 K = raw * 2 centi-K
+        return self.read_reg_into(0x06) * 2 - 27315
+
+    def read_object_centi(self):
+        """Nesne sıcaklığı (°C x 100, tam sayı)"""
+        return self.read_reg_into(0x07) * 2 - 27315
+
+    def read_into(self, raw, offset):
+        """Ortak sensör arayüzü: ortam ve nesne sıcaklığını raw'a yaz"""
+        raw[offset] = self.read_ambient_centi()
+        raw[offset + 1] = self.read_object_centi()
+
+
+def create(i2c, address):
+    """Sürücü kaydı (sensors.py) için fabrika fonksiyonu"""
+    return MLX90614(i2c, address)
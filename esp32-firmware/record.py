@@ -0,0 +1,344 @@
+"""
+Sabit Noktalı Ölçüm Kaydı ve JSON Kodlayıcı
+Değerler yüzde birlik tam sayı olarak tutulur (24.56°C → 2456); küçük tam sayılar
+MicroPython'da heap'ten yer ayırmadığı için kayıtlar yerinde tekrar kullanılabilir
+"""
+
+from array import array
+
+# Kayıt alanları (array("i") indeksleri)
+R_TS = 0  # Monotonik damga (timebase.clock.now())
+R_TEMP = 1  # Ortam sıcaklığı (°C x 100)
+R_HUM = 2  # Bağıl nem (% x 100)
+R_BODY = 3  # Vücut sıcaklığı (°C x 100)
+R_SEQ = 4  # Cihaz başına sıra numarası (sequence.SequenceCounter)
+R_TEMP_CONF = 5  # Füzyon güveni, 0-100 (fusion.Fusion)
+R_HUM_CONF = 6
+R_BODY_CONF = 7
+R_INSTALL = 8  # Sıra numarasının ait olduğu kurulum kimliği (sequence.SequenceCounter)
+RECORD_SIZE = 9
+
+# Okunamayan değer işareti (JSON'da null olarak yazılır)
+MISSING = -1000000
+
+# Toplu (rollup) kova alanları: zaman aralığı + alan başına min/max/toplam/adet
+B_START = 0  # İlk örneğin monotonik damgası
+B_END = 1  # Son örneğin monotonik damgası
+B_COUNT = 2  # Kovadaki örnek sayısı
+B_SEQ = 3  # İlk örneğin sıra numarası (resolution ile kovanın tekrar ayıklama anahtarı)
+B_SEQ_LAST = 4  # Son örneğin sıra numarası
+B_INSTALL = 5  # Örneklerin kurulum kimliği (kimlik değişince yeni kova açılır)
+B_STATS = 6  # İlk alanın istatistiklerinin başladığı indeks
+B_FIELDS = 3  # temperature, humidity, bodyTemperature (sırasıyla)
+F_MIN = 0
+F_MAX = 1
+F_SUM = 2
+F_N = 3  # Alanın geçerli örnek sayısı (ortalama = toplam / adet)
+FIELD_SIZE = 4
+BUCKET_SIZE = B_STATS + B_FIELDS * FIELD_SIZE
+
+# Toplu gönderimde tek bir öğenin deviceId hariç kaplayabileceği en fazla bayt:
+# tüm alanları en uzun int32 değerli kova 413 bayt (ham kayıt 265)
+MAX_ITEM_BYTES = 416
+
+# Toplu gövdenin sabit parçaları: '{"records":[' ve ']}'
+_BATCH_OVERHEAD = 14
+
+# Ay uzunlukları (artık olmayan yıl)
+_MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def new_record():
+    """Boş (tüm alanları MISSING) kayıt oluştur"""
+    return array("i", [MISSING] * RECORD_SIZE)
+
+
+def new_bucket():
+    """Boş kova oluştur"""
+    return array("i", [MISSING] * BUCKET_SIZE)
+
+
+def clear_record(rec):
+    """Kaydı yerinde temizle"""
+    for i in range(RECORD_SIZE):
+        rec[i] = MISSING
+
+
+def copy_record(dst, src):
+    """Kaydı yerinde kopyala"""
+    for i in range(RECORD_SIZE):
+        dst[i] = src[i]
+
+
+def bucket_mean(bucket, k):
+    """Kovadaki k. alanın ortalaması (x100, değer yoksa MISSING)"""
+    f = B_STATS + k * FIELD_SIZE
+    n = bucket[f + F_N]
+    if not n:
+        return MISSING
+    return (bucket[f + F_SUM] + n // 2) // n
+
+
+def batch_bytes(device_id, items):
+    """items öğelik toplu gövdenin en kötü durumda kaplayacağı bayt (ayırıcılar dahil)"""
+    return _BATCH_OVERHEAD + items * (MAX_ITEM_BYTES + len(device_id) + 1)
+
+
+def has_values(rec):
+    """Kayıtta en az bir ölçüm var mı?"""
+    return rec[R_TEMP] != MISSING or rec[R_HUM] != MISSING or rec[R_BODY] != MISSING
+
+
+def centi_str(value):
+    """Sabit noktalı değeri log için string'e çevir (heap kullanır)"""
+    if value == MISSING:
+        return "-"
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    return f"{sign}{value // 100}.{value % 100:02d}"
+
+
+class JsonEncoder:
+    """
+    Kaydı önceden ayrılmış bytearray'e backend JSON formatında yaz
+    Tek kayıt (encode) veya toplu gönderim ({"records": [...]}) desteklenir;
+    kararlı durumda heap tahsisi yapmaz
+    Varsayılan 2048 bayt kısa deviceId ile 4 öğelik batch alır; daha büyük batch'ler
+    için size = batch_bytes(device_id, öğe sayısı) verilmeli
+    """
+
+    def __init__(self, device_id, boot_epoch=0, size=2048):
+        self.buf = bytearray(size)
+        self.len = 0
+        self.items = 0
+        self._device_id = device_id.encode()
+        self._boot_epoch = boot_epoch
+        self._item_bytes = MAX_ITEM_BYTES + len(self._device_id)
+
+        # Sabit parçalar bir kez oluşturulur
+        self._k_temp = b'{"temperature":'
+        self._k_hum = b',"humidity":'
+        self._k_body = b',"bodyTemperature":'
+        self._k_device = b',"deviceId":"'
+        self._k_install = b'","installId":'
+        self._k_seq = b',"seq":'
+        self._k_conf = b',"confidence":{"temperature":'
+        self._k_boot = b',"bootEpoch":'
+        self._k_resolution = b',"resolution":'
+        self._k_samples = b',"samples":'
+        self._k_stats = b',"stats":{'
+        self._k_min = b'":{"min":'
+        self._k_max = b',"max":'
+        self._k_ts = b',"timestamp":"'
+        self._k_end_ts = b'Z"'
+        self._k_batch = b'{"records":['
+        self._k_batch_end = b"]}"
+        self._field_names = (b'"temperature', b'"humidity', b'"bodyTemperature')
+        self._null = b"null"
+
+    def encode(self, rec, utc):
+        """
+        Kaydı JSON'a çevir, yazılan bayt sayısını dön
+        utc: 2000-01-01'den beri UTC saniye (None ise timestamp yazılmaz)
+        """
+        self.len = 0
+        self._put_record(rec, utc)
+        return self.len
+
+    def encode_bucket(self, bucket, resolution, utc):
+        """
+        Toplu kovayı JSON'a çevir (değerler ortalama, stats içinde min/max)
+        resolution: kova genişliği (saniye), utc: kova başlangıcı
+        """
+        self.len = 0
+        self._put_bucket(bucket, resolution, utc)
+        return self.len
+
+    def begin_batch(self):
+        """Toplu gönderim gövdesini başlat"""
+        self.len = 0
+        self.items = 0
+        self._put(self._k_batch)
+
+    def add_record(self, rec, utc):
+        """Toplu gövdeye kayıt ekle, yer kalmadıysa False dön"""
+        if not self._batch_room():
+            return False
+        self._put_record(rec, utc)
+        return True
+
+    def add_bucket(self, bucket, resolution, utc):
+        """Toplu gövdeye kova ekle, yer kalmadıysa False dön"""
+        if not self._batch_room():
+            return False
+        self._put_bucket(bucket, resolution, utc)
+        return True
+
+    def end_batch(self):
+        """Toplu gövdeyi kapat, toplam bayt sayısını dön"""
+        self._put(self._k_batch_end)
+        return self.len
+
+    def _batch_room(self):
+        """Bir öğe daha sığar mı? (sığarsa ayırıcı virgülü de yazar)"""
+        # virgül + öğe + kapanış ']}'
+        if self.len + 1 + self._item_bytes + 2 > len(self.buf):
+            return False
+        if self.items:
+            self._put_char(44)  # ','
+        self.items += 1
+        return True
+
+    def _put_record(self, rec, utc):
+        """Ham kaydı JSON nesnesi olarak yaz"""
+        self._put_values(
+            rec[R_TEMP], rec[R_HUM], rec[R_BODY], rec[R_INSTALL], rec[R_SEQ]
+        )
+
+        # Füzyon güveni (0-100, değer yoksa null)
+        self._put(self._k_conf)
+        self._put_int(rec[R_TEMP_CONF])
+        self._put(self._k_hum)
+        self._put_int(rec[R_HUM_CONF])
+        self._put(self._k_body)
+        self._put_int(rec[R_BODY_CONF])
+        self._put_char(125)  # '}'
+
+        self._put_tail(utc)
+
+    def _put_bucket(self, bucket, resolution, utc):
+        """Kovayı JSON nesnesi olarak yaz"""
+        self._put_values(
+            bucket_mean(bucket, 0),
+            bucket_mean(bucket, 1),
+            bucket_mean(bucket, 2),
+            bucket[B_INSTALL],
+            bucket[B_SEQ],
+        )
+        self._put(self._k_resolution)
+        self._put_uint(resolution, 1)
+        self._put(self._k_samples)
+        self._put_uint(bucket[B_COUNT], 1)
+
+        self._put(self._k_stats)
+        for k in range(B_FIELDS):
+            f = B_STATS + k * FIELD_SIZE
+            if k:
+                self._put_char(44)  # ','
+            self._put(self._field_names[k])
+            self._put(self._k_min)
+            self._put_centi(bucket[f + F_MIN] if bucket[f + F_N] else MISSING)
+            self._put(self._k_max)
+            self._put_centi(bucket[f + F_MAX] if bucket[f + F_N] else MISSING)
+            self._put_char(125)  # '}'
+        self._put_char(125)
+
+        self._put_tail(utc)
+
+    def _put_values(self, temperature, humidity, body_temperature, install_id, seq):
+        """Ölçüm alanlarını, deviceId, installId, seq ve bootEpoch'u yaz"""
+        self._put(self._k_temp)
+        self._put_centi(temperature)
+        self._put(self._k_hum)
+        self._put_centi(humidity)
+        self._put(self._k_body)
+        self._put_centi(body_temperature)
+        self._put(self._k_device)
+        self._put(self._device_id)
+        self._put(self._k_install)
+        self._put_int(install_id)
+        self._put(self._k_seq)
+        self._put_uint(seq, 1)
+        self._put(self._k_boot)
+        self._put_uint(self._boot_epoch, 1)
+
+    def _put_tail(self, utc):
+        """Varsa timestamp'i yaz ve nesneyi kapat"""
+        if utc is not None:
+            self._put(self._k_ts)
+            self._put_iso(utc)
+            self._put(self._k_end_ts)
+        self._put_char(125)  # '}'
+
+    def _put(self, data):
+        """Bayt dizisini tampona ekle"""
+        n = self.len
+        for b in data:
+            self.buf[n] = b
+            n += 1
+        self.len = n
+
+    def _put_char(self, c):
+        """Tek karakter (ASCII kodu) ekle"""
+        self.buf[self.len] = c
+        self.len += 1
+
+    def _put_uint(self, value, width):
+        """Pozitif tam sayıyı en az width basamakla (sıfır dolgulu) yaz"""
+        digits = 1
+        scale = 1
+        while value // scale >= 10:
+            scale *= 10
+            digits += 1
+        while width > digits:
+            self._put_char(48)
+            width -= 1
+        while scale:
+            self._put_char(48 + (value // scale) % 10)
+            scale //= 10
+
+    def _put_int(self, value):
+        """Pozitif tam sayıyı yaz (MISSING ise null)"""
+        if value == MISSING:
+            self._put(self._null)
+        else:
+            self._put_uint(value, 1)
+
+    def _put_centi(self, value):
+        """Sabit noktalı değeri (x100) ondalık sayı olarak yaz"""
+        if value == MISSING:
+            self._put(self._null)
+            return
+        if value < 0:
+            self._put_char(45)  # '-'
+            value = -value
+        self._put_uint(value // 100, 1)
+        self._put_char(46)  # '.'
+        self._put_uint(value % 100, 2)
+
+    def _put_iso(self, utc):
+        """2000 tabanlı UTC saniyeyi YYYY-MM-DDTHH:MM:SS olarak yaz (Z hariç)"""
+        days = utc // 86400
+        secs = utc % 86400
+
+        # Gün sayısından tarih (2000 artık yıl; 400 yıllık döngü ile doğru)
+        year = 2000
+        while True:
+            leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            year_days = 366 if leap else 365
+            if days < year_days:
+                break
+            days -= year_days
+            year += 1
+
+        month = 0
+        while True:
+            month_days = _MONTH_DAYS[month]
+            if month == 1 and leap:
+                month_days = 29
+            if days < month_days:
+                break
+            days -= month_days
+            month += 1
+
+        self._put_uint(year, 4)
+        self._put_char(45)
+        self._put_uint(month + 1, 2)
+        self._put_char(45)
+        self._put_uint(days + 1, 2)
+        self._put_char(84)  # 'T'
+        self._put_uint(secs // 3600, 2)
+        self._put_char(58)
+        self._put_uint(secs // 60 % 60, 2)
+        self._put_char(58)
+        self._put_uint(secs % 60, 2)
@@ -0,0 +1,189 @@
+"""
+Sensör Sürücü Kaydı
+Sürücüler I2C adreslerini, chip ID kontrolünü ve ölçüm kanallarını burada bildirir;
+sürücü modülü sadece i2c.scan() eşleşen bir cihaz bulursa import edilir
+
+Ortak okuma arayüzü (sürücü modülündeki create() fonksiyonunun döndürdüğü nesne):
+    read_into(raw, offset)  → kanal değerlerini raw[offset:] içine yazar (x100)
+                              okunamayan kanal MISSING kalır, hata durumunda exception
+"""
+
+from record import R_BODY, R_HUM, R_TEMP
+
+# Sürücü bağlantı tipleri
+BUS_I2C = 0
+BUS_PIN = 1
+
+
+class SensorSpec:
+    """
+    Sürücü bildirimi (sürücü modülünü import etmeden tutulur)
+    channels: (etiket, birim, kayıt alanı veya None, gürültü, çözünürlük) listesi;
+              gürültü, füzyonun başlangıç noktası olan veri sayfası doğruluğudur
+              (±centi); çözünürlük okumanın en küçük adımıdır (centi), öğrenilen
+              gürültü bunun kuantalama varyansının altına inmez
+    probe: (register, kabul edilen chip ID'leri); ID'ler None ise register
+           cihazın kendi adresini içermeli (SMBus adres register'ı)
+    hint: başlatma hatasında gösterilecek bağlantı ipucu
+    """
+
+    def __init__(
+        self, name, module, channels, bus=BUS_I2C, addresses=(), probe=None, hint=None
+    ):
+        self.name = name
+        self.module = module
+        self.channels = channels
+        self.bus = bus
+        self.addresses = addresses
+        self.probe = probe
+        self.hint = hint
+
+    def matches(self, i2c, address):
+        """Adres ve chip ID bu sürücüye uyuyor mu?"""
+        if address not in self.addresses:
+            return False
+        if self.probe is None:
+            return True
+
+        reg, ids = self.probe
+        try:
+            value = i2c.readfrom_mem(address, reg, 1)[0]
+        except OSError:
+            return False
+        return value == address if ids is None else value in ids
+
+    def create(self, *args):
+        """Sürücü modülünü import et ve sensör nesnesini oluştur"""
+        module = __import__(self.module)
+        return module.create(*args)
+
+
+class Sensor:
+    """Keşfedilen sensör: sürücü nesnesi + raw tamponundaki kanal konumu"""
+
+    def __init__(self, spec, driver, address, offset):
+        self.spec = spec
+        self.driver = driver
+        self.address = address
+        self.offset = offset
+        self.name = spec.name
+
+        # Sağlık durumu (durum sunucusu için): ardışık/toplam hata, son başarılı okuma
+        self.failures = 0
+        self.errors = 0
+        self.last_ok = -1
+
+    def label(self):
+        """Log için sensör adı (I2C ise adresiyle)"""
+        if self.spec.bus == BUS_I2C:
+            return f"{self.name} ({hex(self.address)})"
+        return self.name
+
+
+# Kayıtlı sürücüler (sıra, aynı adresi paylaşan sürücülerde deneme sırasıdır)
+REGISTRY = []
+
+
+def register(spec):
+    """Yeni sürücü bildirimi ekle"""
+    REGISTRY.append(spec)
+    return spec
+
+
+register(
+    SensorSpec(
+        "BME280",
+        "bme280",
+        (("Sıcaklık", "°C", R_TEMP, 50, 1), ("Nem", "%", R_HUM, 300, 1)),
+        addresses=(0x76, 0x77),
+        probe=(0xD0, (0x60,)),
+        hint="SDO pini GND'ye mi bağlı (0x76) yoksa VCC'ye mi (0x77)?",
+    )
+)
+
+# BMP280 aynı sürücüyü kullanır ama nem sensörü yoktur
+register(
+    SensorSpec(
+        "BMP280",
+        "bme280",
+        (("Sıcaklık", "°C", R_TEMP, 50, 1),),
+        addresses=(0x76, 0x77),
+        probe=(0xD0, (0x58,)),
+    )
+)
+
+# MLX90614'ün chip ID'si yok; EEPROM 0x0E (komut 0x2E) SMBus adresini tutar
+register(
+    SensorSpec(
+        "MLX90614",
+        "mlx90614",
+        (
+            ("Ortam Sıcaklığı", "°C", None, 50, 2),
+            ("Nesne Sıcaklığı", "°C", R_BODY, 50, 2),
+        ),
+        addresses=(0x5A,),
+        probe=(0x2E, None),
+    )
+)
+
+# DHT11 I2C değil, sabit pine bağlı: taranamaz, pin yapılandırılmışsa başlatılır
+register(
+    SensorSpec(
+        "DHT11",
+        "dht11",
+        (("Sıcaklık", "°C", R_TEMP, 200, 100), ("Nem", "%", R_HUM, 500, 100)),
+        bus=BUS_PIN,
+    )
+)
+
+
+def discover(i2c, devices, pins):
+    """
+    Taranan I2C adresleri ve yapılandırılmış pinler için sürücüleri başlat
+    devices: i2c.scan() sonucu, pins: {sürücü adı: pin numarası}
+    Sensor listesi ve toplam kanal sayısını döner
+    """
+    sensors = []
+    offset = 0
+
+    for spec in REGISTRY:
+        if spec.bus != BUS_PIN or spec.name not in pins:
+            continue
+        sensor = _start(spec, (pins[spec.name],), None, offset)
+        if sensor:
+            sensors.append(sensor)
+            offset += len(spec.channels)
+
+    for address in devices:
+        spec = None
+        for candidate in REGISTRY:
+            if candidate.bus == BUS_I2C and candidate.matches(i2c, address):
+                spec = candidate
+                break
+
+        if spec is None:
+            print(f"  └─ {hex(address)}: Bilinmeyen cihaz")
+            continue
+
+        print(f"  └─ {hex(address)}: {spec.name}")
+        sensor = _start(spec, (i2c, address), address, offset)
+        if sensor:
+            sensors.append(sensor)
+            offset += len(spec.channels)
+
+    return sensors, offset
+
+
+def _start(spec, args, address, offset):
+    """Sürücüyü oluştur, hata olursa logla ve None dön"""
+    try:
+        driver = spec.create(*args)
+    except Exception as e:
+        print(f"✗ {spec.name} hatası: {e}")
+        if spec.hint:
+            print(f"   Kontrol edin: {spec.hint}")
+        return None
+
+    sensor = Sensor(spec, driver, address, offset)
+    print(f"✓ {sensor.label()} başlatıldı")
+    return sensor
@@ -0,0 +1,95 @@
+"""
+Cihaz Başına Sıra Numarası
+Her kayda yeniden başlatmalar arasında da artan bir sıra numarası (seq) verilir;
+backend (deviceId, installId, seq) ile tekrar gönderilen kayıtları ayıklar
+"""
+
+import os
+
+# Flash yıpranmasını önlemek için numaralar bloklar halinde rezerve edilir:
+# her kayıtta değil, blok dolunca dosyaya yazılır. Reboot'ta rezerve edilen
+# blok sonundan devam edilir (birkaç numara atlanabilir ama asla tekrar edilmez)
+SEQ_BLOCK = 1000
+
+
+def new_install_id():
+    """Rastgele kurulum kimliği (30 bit, MicroPython small int ve array("i") içinde)"""
+    return int.from_bytes(os.urandom(4), "big") >> 2
+
+
+class SequenceCounter:
+    """
+    Sıra numaraları bir kurulum kimliğine (install_id) aittir: seq.dat ilk
+    oluşturulurken rastgele seçilir. Dosya kaybolur veya bozulursa numaralar 0'dan
+    başlar ama yeni kimlikle, eski kayıtlarla çakışmaz
+    """
+
+    def __init__(self, path="seq.dat", block=SEQ_BLOCK):
+        self.path = path
+        self.block = block
+
+        state = self._load()
+        if state is None:
+            self.install_id = new_install_id()
+            self.boot_epoch = 1
+            self.next = 0
+            self.persistent = False
+        else:
+            self.install_id, epoch, self.next = state
+            self.boot_epoch = epoch + 1
+            self.persistent = True
+
+        self.reserved = self.next + block
+        self._commit()
+
+        print(
+            f"✓ Sequence: install {self.install_id}, boot #{self.boot_epoch},"
+            f" starting at seq {self.next}"
+        )
+
+    def take(self):
+        """Bir sonraki sıra numarasını dön (install_id değişmiş olabilir, sonra okunmalı)"""
+        if self.next >= self.reserved:
+            self.reserved += self.block
+            self._commit()
+        seq = self.next
+        self.next += 1
+        return seq
+
+    def _commit(self):
+        """
+        Rezervasyonu dosyaya yaz; yazılamazsa dosyadaki kimlikle numara verilmeye
+        devam edilmez (reboot'ta aynı numaralar tekrar verilirdi): kaydedilmemiş
+        yeni bir kimlikle 0'dan devam edilir
+        """
+        if self._save():
+            self.persistent = True
+            return
+
+        if self.persistent:
+            self.install_id = new_install_id()
+            self.next = 0
+            self.reserved = self.block
+            self.persistent = False
+            print(f"⚠️  Sequence: switched to unsaved install {self.install_id}")
+
+    def _load(self):
+        """Kayıtlı (install_id, boot_epoch, reserved) değerlerini oku (yoksa None)"""
+        try:
+            with open(self.path) as f:
+                install_id, epoch, reserved = f.read().split()
+            return int(install_id), int(epoch), int(reserved)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self):
+        """Durumu dosyaya yaz (geçici dosya + rename ile, yarım yazma olmasın)"""
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                f.write(f"{self.install_id} {self.boot_epoch} {self.reserved}")
+            os.rename(tmp, self.path)
+            return True
+        except OSError as e:
+            print(f"⚠️  Sequence state could not be saved: {e}")
+            return False
@@ -0,0 +1,263 @@
+"""
+Yerel Ağ Durum Sunucusu
+Aynı WiFi'daki istemcilere son ölçümü, buffer doluluğunu, sensör sağlığını ve
+çalışma süresini HTTP üzerinden sunar. Cevaplar bellekteki son durumdan üretilir
+(istek başına sensör okunmaz); sunucu sadece örnekleme döngüsünün boş zamanında,
+bloklamayan soketlerle çalışır
+"""
+
+import time
+
+try:
+    import socket
+except ImportError:
+    import usocket as socket
+
+try:
+    import select
+except ImportError:
+    import uselect as select
+
+# İstek başlığı için en fazla bayt (daha büyük istekler 431 ile reddedilir)
+REQUEST_MAX_BYTES = 512
+
+# Bir bağlantının isteğini gönderip cevabını alması için süre (ms)
+CLIENT_TIMEOUT_MS = 2000
+
+# Bağlantı durumları
+_READING = 0
+_WRITING = 1
+
+_REASONS = {
+    200: "OK",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class _Client:
+    """Tek bir istemci bağlantısı (istek tamponu + gönderilecek cevap)"""
+
+    def __init__(self, sock, deadline):
+        self.sock = sock
+        self.deadline = deadline
+        self.state = _READING
+        self.request = b""
+        self.out = None
+
+
+class StatusServer:
+    """
+    Poll tabanlı küçük HTTP sunucusu
+    render: durum JSON'unu (str) dönen fonksiyon, sadece istek geldiğinde çağrılır
+    socket_module / select_module: host üzerinde test için yerine geçen modüller
+    Limit doluyken yeni bağlantı kabul edilmez: listen kuyruğunda bir bağlantı
+    kapanana kadar bekler (kabul edip isteği okumadan kapatmak istemciye TCP
+    reset olarak ulaşır)
+    """
+
+    def __init__(
+        self,
+        render,
+        port=80,
+        max_clients=2,
+        socket_module=socket,
+        select_module=select,
+    ):
+        self.render = render
+        self.port = port
+        self.max_clients = max_clients
+        self._socket = socket_module
+        self._select = select_module
+
+        self.sock = None
+        self._poller = None
+        self._clients = []
+        self._listening = False
+
+        self.requests = 0
+
+    def start(self):
+        """Dinleyen soketi aç (bloklamayan)"""
+        sock = self._socket.socket()
+        try:
+            sock.setsockopt(self._socket.SOL_SOCKET, self._socket.SO_REUSEADDR, 1)
+            sock.bind(self._socket.getaddrinfo("0.0.0.0", self.port)[0][-1])
+            sock.listen(self.max_clients)
+            sock.setblocking(False)
+        except Exception:
+            sock.close()
+            raise
+
+        self._poller = self._select.poll()
+        self.sock = sock
+        self._listen(True)
+        print(f"✓ Status server listening on port {self.port} (/status)")
+
+    def stop(self):
+        """Tüm bağlantıları ve dinleyen soketi kapat"""
+        if self.sock:
+            self._listen(False)
+            sock = self.sock
+            self.sock = None
+            sock.close()
+        while self._clients:
+            self._close(self._clients[0])
+
+    def active(self):
+        """Açık istemci bağlantısı sayısı"""
+        return len(self._clients)
+
+    def serve(self, timeout_ms):
+        """
+        timeout_ms boyunca bağlantıları işle ve süre dolunca dön
+        Örnekleme döngüsünün bekleme süresi yerine çağrılır (time.sleep_ms gibi)
+        """
+        if self.sock is None:
+            time.sleep_ms(timeout_ms)
+            return
+
+        deadline = time.ticks_add(time.ticks_ms(), timeout_ms)
+        while True:
+            now = time.ticks_ms()
+            self._expire(now)
+            remaining = time.ticks_diff(deadline, now)
+            if remaining <= 0:
+                return
+
+            for obj, event in self._poller.poll(remaining):
+                if self._is(obj, self.sock):
+                    self._accept(now)
+                    continue
+                client = self._find(obj)
+                if client:
+                    self._handle(client, event)
+
+    @staticmethod
+    def _is(obj, sock):
+        """Poll sonucu bu sokete mi ait? (MicroPython nesne, CPython fd döner)"""
+        return obj is sock or (isinstance(obj, int) and obj == sock.fileno())
+
+    def _find(self, obj):
+        for client in self._clients:
+            if self._is(obj, client.sock):
+                return client
+        return None
+
+    def _accept(self, now):
+        """Yeni bağlantıyı kabul et; limit dolduysa dinleyen soketi yoklamayı bırak"""
+        try:
+            sock, _ = self.sock.accept()
+        except OSError:
+            return
+
+        sock.setblocking(False)
+        client = _Client(sock, time.ticks_add(now, CLIENT_TIMEOUT_MS))
+        self._clients.append(client)
+        self._poller.register(sock, self._select.POLLIN)
+
+        if len(self._clients) >= self.max_clients:
+            self._listen(False)
+
+    def _listen(self, enabled):
+        """Dinleyen soketi poll'a ekle/çıkar (çıkarılınca bağlantılar kuyrukta bekler)"""
+        if enabled == self._listening:
+            return
+        if enabled:
+            self._poller.register(self.sock, self._select.POLLIN)
+        else:
+            self._poller.unregister(self.sock)
+        self._listening = enabled
+
+    def _handle(self, client, event):
+        """Bağlantı olayını işle (istek oku veya cevap yaz)"""
+        if event & (self._select.POLLERR | self._select.POLLHUP):
+            self._close(client)
+            return
+
+        try:
+            if client.state == _READING and event & self._select.POLLIN:
+                self._read(client)
+            elif client.state == _WRITING and event & self._select.POLLOUT:
+                self._write(client)
+        except OSError:
+            self._close(client)
+
+    def _read(self, client):
+        data = client.sock.recv(REQUEST_MAX_BYTES - len(client.request))
+        if not data:
+            self._close(client)
+            return
+
+        client.request += data
+        if b"\r\n\r\n" in client.request:
+            self._respond(client, self._route(client.request))
+        elif len(client.request) >= REQUEST_MAX_BYTES:
+            self._respond(client, self._response(431, b'{"error":"too large"}'))
+
+    def _write(self, client):
+        sent = client.sock.send(client.out)
+        client.out = client.out[sent:]
+        if not client.out:
+            self._close(client)
+
+    def _respond(self, client, response):
+        """Cevabı gönderilmek üzere sıraya al"""
+        client.state = _WRITING
+        client.out = memoryview(response)
+        self._poller.modify(client.sock, self._select.POLLOUT)
+
+    def _route(self, request):
+        """İstek satırına göre cevabı üret"""
+        line = request.split(b"\r\n", 1)[0].split()
+        if len(line) < 2:
+            return self._response(404, b'{"error":"not found"}')
+
+        method, path = line[0], line[1].split(b"?", 1)[0]
+        if path not in (b"/", b"/status"):
+            return self._response(404, b'{"error":"not found"}')
+        if method != b"GET":
+            return self._response(405, b'{"error":"method not allowed"}')
+
+        self.requests += 1
+        try:
+            body = self.render().encode()
+        except Exception as e:
+            print(f"⚠️  Status render error: {e}")
+            return self._response(500, b'{"error":"internal"}')
+        return self._response(200, body)
+
+    @staticmethod
+    def _response(status, body):
+        head = (
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Cache-Control: no-store\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        return head.encode() + body
+
+    def _expire(self, now):
+        """Süresi dolan (yavaş veya yarım kalan) bağlantıları kapat"""
+        for client in self._clients[:]:
+            if time.ticks_diff(now, client.deadline) >= 0:
+                self._close(client)
+
+    def _close(self, client):
+        try:
+            self._poller.unregister(client.sock)
+        except (KeyError, OSError, ValueError):
+            pass
+        try:
+            client.sock.close()
+        except OSError:
+            pass
+        self._clients.remove(client)
+
+        # Yer açıldı: kuyrukta bekleyen bağlantılar kabul edilebilir
+        if self.sock and len(self._clients) < self.max_clients:
+            self._listen(True)
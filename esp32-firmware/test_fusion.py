@@ -0,0 +1,136 @@
+"""
+Füzyon Host Testi
+Fusion'ı sabit gürültü desenli sentetik okumalarla çalıştırır; donanım gerekmez
+
+Host:  python -m pytest test_fusion.py   veya   micropython test_fusion.py
+"""
+
+from array import array
+
+from fusion import Fusion
+from record import (
+    MISSING,
+    R_BODY,
+    R_BODY_CONF,
+    R_HUM,
+    R_TEMP,
+    R_TEMP_CONF,
+    R_TS,
+    RECORD_SIZE,
+)
+
+SAMPLE_S = 5
+
+# Tekrarlanan küçük okuma gürültüsü (centi)
+JITTER = (0, 2, -1, 3, -2, 1, -3, 0, 2, -2)
+
+BME = (R_TEMP, 0, 50, 1, "BME280 Sıcaklık")
+DHT = (R_TEMP, 1, 200, 100, "DHT11 Sıcaklık")
+DHT_HUM = (R_HUM, 2, 500, 100, "DHT11 Nem")
+MLX = (R_BODY, 3, 50, 2, "MLX90614 Nesne Sıcaklığı")
+
+
+class _Run:
+    """Fusion'ı örnek örnek besler, her örnekten sonra kaydı saklar"""
+
+    def __init__(self, *channels):
+        self.fusion = Fusion(list(channels))
+        self.raw = array("i", [MISSING] * 4)
+        self.rec = array("i", [MISSING] * RECORD_SIZE)
+        self.samples = 0
+
+    def feed(self, readings, count=1, jitter=True):
+        """readings: {raw indeksi: okuma}; count örnek boyunca aynı okumalar verilir"""
+        for _ in range(count):
+            for i in range(len(self.raw)):
+                self.raw[i] = MISSING
+            for i, value in readings.items():
+                if jitter and value != MISSING:
+                    value += JITTER[(self.samples + i) % len(JITTER)]
+                self.raw[i] = value
+            self.rec[R_TS] = self.samples * SAMPLE_S
+            self.fusion.update(self.raw, self.rec)
+            self.samples += 1
+        return self.rec
+
+
+def test_two_channel_step():
+    run = _Run(BME, DHT)
+    rec = run.feed({0: 2200, 1: 2200}, 40)
+    assert abs(rec[R_TEMP] - 2200) <= 5
+    assert rec[R_TEMP_CONF] >= 90
+
+    # Gerçek sıçramada iki kanal birlikte reddedilir: eski değer düşük güvenle gider
+    rec = run.feed({0: 2500, 1: 2500})
+    assert rec[R_TEMP_CONF] < 10
+
+    # Birkaç örnek sonra tahmin yeni seviyeye geçer ve güven geri gelir
+    rec = run.feed({0: 2500, 1: 2500}, 10)
+    assert abs(rec[R_TEMP] - 2500) <= 5
+    assert rec[R_TEMP_CONF] >= 90
+
+
+def test_single_channel_step():
+    run = _Run(MLX)
+    rec = run.feed({3: 3650}, 40)
+    assert abs(rec[R_BODY] - 3650) <= 5
+    assert rec[R_BODY_CONF] >= 90
+
+    # Tek kanal reddedilirken eski değer yüksek güvenle gönderilmez
+    for _ in range(3):
+        rec = run.feed({3: 3780})
+        assert abs(rec[R_BODY] - 3650) <= 5
+        assert rec[R_BODY_CONF] < 10
+
+    rec = run.feed({3: 3780}, 5)
+    assert abs(rec[R_BODY] - 3780) <= 5
+    assert rec[R_BODY_CONF] >= 90
+
+
+def test_quantized_channel_follows_one_step():
+    # DHT11 1°C / 1% adımlarla okur: tek adımlık değişim reddedilmeden izlenir
+    run = _Run(DHT, DHT_HUM)
+    run.feed({1: 2400, 2: 5500}, 40, jitter=False)
+    rejected = [est.rejected[0] for est in run.fusion.estimators[:2]]
+
+    rec = run.feed({1: 2500, 2: 5600}, 15, jitter=False)
+    assert [est.rejected[0] for est in run.fusion.estimators[:2]] == rejected
+    assert rec[R_TEMP] > 2450
+    assert rec[R_HUM] > 5550
+
+
+def test_outlier_is_rejected():
+    run = _Run(BME, DHT)
+    run.feed({0: 2200, 1: 2200}, 40)
+    bme = run.fusion.estimators[0]
+    rejected = bme.rejected[0]
+
+    rec = run.feed({0: 9000, 1: 2200})
+    assert bme.rejected[0] == rejected + 1
+    assert abs(rec[R_TEMP] - 2200) <= 5
+    # Kanallar ayrıştı: değer korunur ama güven düşer
+    assert rec[R_TEMP_CONF] < 50
+
+    rec = run.feed({0: 2200, 1: 2200}, 2)
+    assert abs(rec[R_TEMP] - 2200) <= 5
+    assert rec[R_TEMP_CONF] >= 90
+    assert bme.reject_runs[0] == 0
+
+
+def test_missing_channels():
+    run = _Run(BME, DHT)
+    run.feed({0: 2200, 1: 2200}, 10)
+
+    # Okumayan kanal tahmini bozmaz, hiç okuma yoksa eski değer gönderilmez
+    rec = run.feed({1: 2200}, 3)
+    assert abs(rec[R_TEMP] - 2200) <= 5
+    rec = run.feed({})
+    assert rec[R_TEMP] == MISSING
+    assert rec[R_TEMP_CONF] == MISSING
+
+
+if __name__ == "__main__":
+    for name in sorted(globals()):
+        if name.startswith("test_"):
+            globals()[name]()
+            print(f"✓ {name}")
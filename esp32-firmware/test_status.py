@@ -0,0 +1,254 @@
+"""
+Durum Sunucusu Host Testi
+StatusServer'ı sahte socket/select modülleriyle ve sahte saatle çalıştırır;
+ağ ve donanım gerekmez
+
+Host:  python -m pytest test_status.py   veya   micropython test_status.py
+"""
+
+import status
+from status import CLIENT_TIMEOUT_MS, StatusServer
+
+POLLIN = 1
+POLLOUT = 4
+POLLERR = 8
+POLLHUP = 16
+
+REQUEST = b"GET /status HTTP/1.1\r\nHost: esp32\r\n\r\n"
+
+
+class _StandInTime:
+    """Poll'da hazır olay yoksa beklenen süre kadar ilerleyen saat"""
+
+    now = 0
+
+    @staticmethod
+    def ticks_ms():
+        return _StandInTime.now
+
+    @staticmethod
+    def ticks_add(ticks, delta):
+        return ticks + delta
+
+    @staticmethod
+    def ticks_diff(a, b):
+        return a - b
+
+    @staticmethod
+    def sleep_ms(ms):
+        _StandInTime.now += ms
+
+
+class _StandInConnection:
+    """Sunucu tarafındaki istemci soketi: gelen istek baytları + gönderilen cevap"""
+
+    def __init__(self, request):
+        self.inbound = request
+        self.sent = b""
+        self.closed = False
+        self.reset = False
+
+    def ready(self):
+        return (POLLIN if self.inbound else 0) | POLLOUT
+
+    def setblocking(self, flag):
+        pass
+
+    def recv(self, n):
+        data = self.inbound[:n]
+        self.inbound = self.inbound[n:]
+        return data
+
+    def send(self, data):
+        self.sent += bytes(data)
+        return len(data)
+
+    def close(self):
+        # Okunmamış veri varken kapatılan TCP soketi RST gönderir
+        self.reset = len(self.inbound) > 0
+        self.closed = True
+
+    def status(self):
+        return int(self.sent.split(b" ", 2)[1]) if self.sent else None
+
+
+class _StandInListener:
+    """Dinleyen soket: connect() ile gelen bağlantılar listen kuyruğunda bekler"""
+
+    def __init__(self):
+        self.backlog = []
+
+    def ready(self):
+        return POLLIN if self.backlog else 0
+
+    def connect(self, request=REQUEST):
+        conn = _StandInConnection(request)
+        self.backlog.append(conn)
+        return conn
+
+    def setsockopt(self, *args):
+        pass
+
+    def bind(self, addr):
+        pass
+
+    def listen(self, backlog):
+        pass
+
+    def setblocking(self, flag):
+        pass
+
+    def accept(self):
+        if not self.backlog:
+            raise OSError(11)  # EAGAIN
+        return self.backlog.pop(0), ("192.168.1.60", 50000)
+
+    def close(self):
+        pass
+
+
+class _StandInPoll:
+    """Kayıtlı nesnelerin hazır olaylarını döner; aynı anda açık bağlantıları sayar"""
+
+    def __init__(self):
+        self.masks = {}
+        self.most_clients = 0
+
+    def register(self, obj, mask):
+        self.masks[obj] = mask
+
+    def modify(self, obj, mask):
+        if obj not in self.masks:
+            raise OSError(2)  # ENOENT
+        self.masks[obj] = mask
+
+    def unregister(self, obj):
+        del self.masks[obj]
+
+    def poll(self, timeout):
+        clients = 0
+        events = []
+        for obj, mask in self.masks.items():
+            if isinstance(obj, _StandInConnection):
+                clients += 1
+            event = obj.ready() & mask
+            if event:
+                events.append((obj, event))
+        self.most_clients = max(self.most_clients, clients)
+
+        if not events:
+            _StandInTime.now += timeout
+        return events
+
+
+class _StandInSocketModule:
+    SOL_SOCKET = 1
+    SO_REUSEADDR = 2
+
+    def __init__(self):
+        self.listener = _StandInListener()
+
+    def socket(self):
+        return self.listener
+
+    @staticmethod
+    def getaddrinfo(host, port):
+        return [(2, 1, 0, "", (host, port))]
+
+
+class _StandInSelectModule:
+    POLLIN = POLLIN
+    POLLOUT = POLLOUT
+    POLLERR = POLLERR
+    POLLHUP = POLLHUP
+
+    def __init__(self):
+        self.poller = None
+
+    def poll(self):
+        self.poller = _StandInPoll()
+        return self.poller
+
+
+def _start(max_clients=2):
+    status.time = _StandInTime
+    _StandInTime.now = 0
+    sockets = _StandInSocketModule()
+    selects = _StandInSelectModule()
+    server = StatusServer(
+        lambda: '{"ok":true}',
+        max_clients=max_clients,
+        socket_module=sockets,
+        select_module=selects,
+    )
+    server.start()
+    return server, sockets.listener, selects.poller
+
+
+def test_serves_status():
+    server, listener, _ = _start()
+    conn = listener.connect()
+    server.serve(100)
+
+    assert conn.status() == 200
+    assert conn.sent.endswith(b'{"ok":true}')
+    assert conn.closed and not conn.reset
+    assert server.requests == 1
+    assert server.active() == 0
+
+
+def test_unknown_path():
+    server, listener, _ = _start()
+    conn = listener.connect(b"GET /nope HTTP/1.1\r\n\r\n")
+    server.serve(100)
+
+    assert conn.status() == 404
+    assert server.requests == 0
+
+
+def test_waits_at_client_limit():
+    server, listener, poller = _start(max_clients=2)
+    conns = [listener.connect() for _ in range(5)]
+    server.serve(100)
+
+    # Limit aşılmaz, fazla bağlantılar reddedilmez: sırayla cevap alır
+    assert poller.most_clients == 2
+    for conn in conns:
+        assert conn.status() == 200
+        assert conn.closed and not conn.reset
+    assert server.active() == 0
+
+
+def test_idle_clients_time_out():
+    server, listener, _ = _start(max_clients=1)
+    idle = listener.connect(b"GET /status HTTP/1.1\r\n")
+    waiting = listener.connect()
+
+    # Yarım istek zaman aşımına kadar yeri tutar, sonra sıradaki bağlantı cevaplanır
+    server.serve(CLIENT_TIMEOUT_MS // 2)
+    assert idle.status() is None and waiting.status() is None
+    assert len(listener.backlog) == 1
+
+    server.serve(CLIENT_TIMEOUT_MS)
+    assert idle.closed and idle.status() is None
+
+    server.serve(100)
+    assert waiting.status() == 200
+
+
+def test_stop_closes_clients():
+    server, listener, poller = _start()
+    conn = listener.connect(b"GET /status")
+    server.serve(10)
+    server.stop()
+
+    assert conn.closed
+    assert server.sock is None
+    assert not poller.masks
+
+
+if __name__ == "__main__":
+    for name in sorted(globals()):
+        if name.startswith("test_"):
+            globals()[name]()
+            print(f"✓ {name}")
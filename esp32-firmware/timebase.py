@@ -0,0 +1,286 @@
+"""
+Monotonik Zaman Tabanı
+Örnekler ticks_ms tabanlı monotonik saniye damgasıyla işaretlenir,
+UTC'ye çeviri NTP offset'i ve sapma (drift) tahmini ile gönderim anında yapılır.
+SNTP isteği bloklamaz: request() başlatır, poll() boş zamanda gönderir ve cevabı alır
+"""
+
+import struct
+import time
+
+try:
+    import socket
+except ImportError:
+    import usocket as socket
+
+try:
+    from config import NTP_RESYNC_INTERVAL
+except ImportError:
+    NTP_RESYNC_INTERVAL = 3600
+
+# NTP epoch'u (1900) ile 2000-01-01 arasındaki fark (saniye)
+NTP_DELTA_Y2K = 3155673600
+
+# Port epoch'u 1970 ise time.gmtime() için 2000 tabanlı saniyeye eklenecek fark
+Y2K_OFFSET = 0 if time.gmtime(0)[0] == 2000 else 946684800
+
+# Başarısız senkronizasyondan sonra ilk tekrar deneme aralığı (saniye)
+NTP_RETRY_INTERVAL = 60
+
+# SNTP cevabı için bekleme süresi (ms); bekleme örnekleme döngüsünün boş zamanında yapılır
+# Bundan geç okunan cevap da reddedilir: soket tamponunda beklediği süre gidiş-dönüş
+# süresine eklenir ve ölçülen an kayar
+NTP_TIMEOUT_MS = 1000
+
+# Art arda bu kadar başarısız denemeden sonra sunucu adı yeniden çözümlenir (DNS)
+NTP_RESOLVE_AFTER = 3
+
+# Drift ölçümü için iki senkronizasyon arasında gereken minimum süre (ms)
+DRIFT_MIN_INTERVAL_MS = 600000
+
+# Bundan büyük ölçülen sapmalar (ppm) hatalı NTP cevabı sayılır
+DRIFT_LIMIT_PPM = 1000
+
+
+class Timebase:
+    """
+    Monotonik saat + NTP'den türetilmiş UTC offset'i
+    now() en az birkaç günde bir çağrılmalı (ticks_ms taşmasını takip etmek için)
+    """
+
+    def __init__(self, resync_interval=NTP_RESYNC_INTERVAL):
+        self.resync_interval = resync_interval
+
+        self._last_ticks = time.ticks_ms()
+        self._mono_s = 0
+        self._mono_ms = 0
+
+        self.synced = False
+        self.sync_count = 0
+        self.drift_ppm = 0
+        self._drift_known = False
+
+        # Son senkronizasyon noktası (ms hassasiyetli, drift hesabı için)
+        self._sync_mono_ms = 0
+        self._sync_utc_ms = 0
+
+        # Örnek çevirisi için saniye hassasiyetli referans
+        self._base_mono_s = 0
+        self._base_utc_s = 0
+
+        self._attempt_s = None
+        self._last_ok = False
+        self._failures = 0
+
+        # Gönderilecek/bekleyen SNTP isteği (bloklamayan UDP soketi), önbellekteki adres
+        self._host = None
+        self._sock = None
+        self._addr = None
+        self._sent_ms = 0
+        self._packet = bytearray(48)
+
+    def now(self):
+        """Açılıştan beri geçen monotonik saniye (örnek damgası)"""
+        t = time.ticks_ms()
+        self._mono_ms += time.ticks_diff(t, self._last_ticks)
+        self._last_ticks = t
+        if self._mono_ms >= 1000:
+            self._mono_s += self._mono_ms // 1000
+            self._mono_ms %= 1000
+        return self._mono_s
+
+    def now_ms(self):
+        """Açılıştan beri geçen monotonik milisaniye (sadece senkronizasyonda kullanılır)"""
+        self.now()
+        return self._mono_s * 1000 + self._mono_ms
+
+    def to_utc(self, mono_s):
+        """Monotonik damgayı 2000-01-01'den beri UTC saniyeye çevir (senkron yoksa None)"""
+        if not self.synced:
+            return None
+        delta = mono_s - self._base_mono_s
+        return self._base_utc_s + delta + delta * self.drift_ppm // 1000000
+
+    def iso_utc(self, mono_s):
+        """Monotonik damgayı ISO 8601 UTC string'e çevir (senkron yoksa None)"""
+        utc = self.to_utc(mono_s)
+        if utc is None:
+            return None
+        t = time.gmtime(utc + Y2K_OFFSET)
+        return "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}Z".format(
+            t[0], t[1], t[2], t[3], t[4], t[5]
+        )
+
+    def due(self):
+        """Yeni bir senkronizasyon isteği başlatma zamanı geldi mi?"""
+        if self.waiting():
+            return False
+        if self._attempt_s is None:
+            return True
+        if self._last_ok:
+            interval = self.resync_interval
+        else:
+            # Başarısız denemeler arasındaki süre her seferinde ikiye katlanır
+            interval = NTP_RETRY_INTERVAL << min(self._failures - 1, 6)
+            if interval > self.resync_interval:
+                interval = self.resync_interval
+        return self.now() - self._attempt_s >= interval
+
+    def waiting(self):
+        """Başlatılmış ve henüz sonuçlanmamış bir SNTP isteği var mı?"""
+        return self._host is not None or self._sock is not None
+
+    def queued(self):
+        """İstek başlatıldı ama paketi henüz gönderilmedi mi?"""
+        return self._host is not None
+
+    def request(self, host):
+        """
+        SNTP isteğini başlat ve beklemeden dön; paket bir sonraki poll() çağrısında
+        gönderilir, böylece gidiş-dönüş süresi sadece boş zamanda ölçülür
+        """
+        if self.waiting():
+            return
+        self._attempt_s = self.now()
+        self._last_ok = False
+        self._host = host
+
+    def _send(self):
+        """
+        İstek paketini bloklamayan UDP soketiyle gönder
+        Sunucu adresi önbelleğe alınır, DNS sadece ilk istekte ve art arda
+        NTP_RESOLVE_AFTER başarısızlıktan sonra tekrarlanır
+        """
+        host = self._host
+        self._host = None
+
+        query = self._packet
+        for i in range(48):
+            query[i] = 0
+        query[0] = 0x1B  # LI=0, VN=3, Mode=3 (client)
+
+        s = None
+        try:
+            if self._addr is None:
+                self._addr = socket.getaddrinfo(host, 123)[0][-1]
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.setblocking(False)
+            s.sendto(query, self._addr)
+        except Exception as e:
+            if s is not None:
+                s.close()
+            self._fail(e)
+            return
+
+        self._sock = s
+        self._sent_ms = self.now_ms()
+
+    def poll(self):
+        """
+        Bekleyen SNTP isteğini gönder veya cevabını bloklamadan kontrol et
+        Senkronizasyon bu çağrıda tamamlandıysa True döner
+        """
+        if self._host is not None:
+            self._send()
+            return False
+        s = self._sock
+        if s is None:
+            return False
+
+        t1 = self.now_ms()
+        try:
+            msg = s.recv(48)
+        except OSError:
+            # Cevap henüz gelmedi (EAGAIN)
+            if t1 - self._sent_ms >= NTP_TIMEOUT_MS:
+                self._close()
+                self._fail("zaman aşımı")
+            return False
+        self._close()
+
+        rtt = t1 - self._sent_ms
+        if rtt > NTP_TIMEOUT_MS:
+            self._fail(f"geç cevap ({rtt} ms)")
+            return False
+
+        try:
+            utc_ms = self._decode(msg)
+        except (OSError, ValueError) as e:
+            self._fail(e)
+            return False
+
+        # Cevap, istek ile yanıtın ortasındaki monotonik ana karşılık gelir
+        self._apply((self._sent_ms + t1) // 2, utc_ms)
+        self._set_rtc(utc_ms // 1000)
+        self._last_ok = True
+        self._failures = 0
+        print(f"✓ NTP senkronizasyonu başarılı ({rtt} ms)")
+        print(f"   Tarih/Saat: {self.iso_utc(self.now())}")
+        return True
+
+    def _close(self):
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        self._sock = None
+
+    def _fail(self, reason):
+        """Başarısız denemeyi kaydet; tekrarlarsa adresi yeniden çözümle"""
+        self._failures += 1
+        if self._failures % NTP_RESOLVE_AFTER == 0:
+            self._addr = None
+        print(f"⚠️  NTP senkronizasyonu başarısız: {reason}")
+        if not self.synced:
+            print("   Tamponlanan veriler senkronizasyon sonrası gönderilecek")
+
+    def _apply(self, mono_ms, utc_ms):
+        """Yeni senkronizasyon noktasını uygula ve drift tahminini güncelle"""
+        if self.synced:
+            elapsed = mono_ms - self._sync_mono_ms
+            predicted = self._sync_utc_ms + elapsed + elapsed * self.drift_ppm // 1000000
+            print(f"   Saat hatası: {utc_ms - predicted} ms ({elapsed // 1000} s sonra)")
+
+            if elapsed >= DRIFT_MIN_INTERVAL_MS:
+                measured = (utc_ms - self._sync_utc_ms - elapsed) * 1000000 // elapsed
+                if -DRIFT_LIMIT_PPM <= measured <= DRIFT_LIMIT_PPM:
+                    if self._drift_known:
+                        self.drift_ppm = (3 * self.drift_ppm + measured) // 4
+                    else:
+                        self.drift_ppm = measured
+                        self._drift_known = True
+                    print(f"   Drift tahmini: {self.drift_ppm} ppm")
+
+        self._sync_mono_ms = mono_ms
+        self._sync_utc_ms = utc_ms
+
+        # Saniye sınırlarını hizala: base_mono_s anına denk gelen UTC saniye
+        self._base_mono_s = mono_ms // 1000
+        self._base_utc_s = (utc_ms - mono_ms % 1000) // 1000
+
+        self.synced = True
+        self.sync_count += 1
+
+    @staticmethod
+    def _decode(msg):
+        """SNTP cevabından 2000-01-01'den beri UTC milisaniye çıkar"""
+        if len(msg) < 48:
+            raise OSError("Eksik NTP cevabı")
+        secs, frac = struct.unpack("!II", msg[40:48])
+        if secs == 0:
+            raise OSError("Geçersiz NTP cevabı")
+        return (secs - NTP_DELTA_Y2K) * 1000 + ((frac * 1000) >> 32)
+
+    @staticmethod
+    def _set_rtc(utc_s):
+        """RTC'yi ayarla (time.localtime() kullanan kodlar için)"""
+        try:
+            import machine
+        except ImportError:
+            return
+        t = time.gmtime(utc_s + Y2K_OFFSET)
+        machine.RTC().datetime((t[0], t[1], t[2], t[6] + 1, t[3], t[4], t[5], 0))
+
+
+# Global zaman tabanı
+clock = Timebase()
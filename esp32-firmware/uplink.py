@@ -0,0 +1,203 @@
+"""
+Kalıcı (keep-alive) HTTP POST istemcisi
+URL, başlıklar ve cevap tamponu bir kez hazırlanır; kararlı durumda gönderim
+heap tahsisi yapmadan mevcut soket üzerinden yapılır
+"""
+
+try:
+    import socket
+except ImportError:
+    import usocket as socket
+
+# Cevap başlığında aranan alan (küçük harfe çevrilmiş olarak karşılaştırılır)
+_CONTENT_LENGTH = b"content-length:"
+
+
+class HttpPoster:
+    def __init__(self, base_url, endpoint, timeout=10, resp_size=512):
+        scheme, _, hostport = base_url.partition("://")
+        hostport = hostport.rstrip("/")
+        self.tls = scheme == "https"
+
+        host, _, port = hostport.partition(":")
+        self.host = host
+        self.port = int(port) if port else (443 if self.tls else 80)
+        self.timeout = timeout
+
+        # İstek başlıkları uç nokta başına bir kez oluşturulur (Content-Length hariç)
+        self._hostport = hostport
+        self._heads = {}
+        self._head = self.add_endpoint(endpoint)
+        self._crlf2 = b"\r\n\r\n"
+        self._len_buf = bytearray(8)
+
+        self._resp = bytearray(resp_size)
+        self._resp_mv = memoryview(self._resp)
+        self._addr = None
+        self.sock = None
+        self.status = 0
+
+    def add_endpoint(self, endpoint):
+        """Ek uç nokta için istek başlığını hazırla"""
+        head = (
+            f"POST {endpoint} HTTP/1.1\r\n"
+            f"Host: {self._hostport}\r\n"
+            "Content-Type: application/json\r\n"
+            "Connection: keep-alive\r\n"
+            "Content-Length: "
+        ).encode()
+        self._heads[endpoint] = head
+        return head
+
+    def close(self):
+        """Soketi kapat (bir sonraki gönderimde yeniden açılır)"""
+        if self.sock:
+            try:
+                self.sock.close()
+            except Exception:
+                pass
+        self.sock = None
+
+    def post(self, buf, length, endpoint=None):
+        """
+        buf[:length] gövdesini POST et, HTTP durum kodunu dön
+        endpoint verilmezse varsayılan uç nokta kullanılır (add_endpoint ile hazırlanmalı)
+        Eski keep-alive soketi kapanmışsa bir kez yeni bağlantı ile tekrar denenir
+        """
+        head = self._head if endpoint is None else self._heads[endpoint]
+        reused = self.sock is not None
+        try:
+            return self._post_once(head, buf, length)
+        except OSError:
+            self.close()
+            if not reused:
+                raise
+        return self._post_once(head, buf, length)
+
+    def _connect(self):
+        """Yeni soket aç (sadece ilk gönderimde veya bağlantı koptuğunda)"""
+        if self._addr is None:
+            self._addr = socket.getaddrinfo(self.host, self.port)[0][-1]
+
+        sock = socket.socket()
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(self._addr)
+            if self.tls:
+                import ssl
+
+                sock = ssl.wrap_socket(sock, server_hostname=self.host)
+        except Exception:
+            sock.close()
+            raise
+        self.sock = sock
+
+    def _post_once(self, head, buf, length):
+        if self.sock is None:
+            self._connect()
+
+        sock = self.sock
+        sock.write(head)
+        sock.write(self._len_buf, self._format_len(length))
+        sock.write(self._crlf2)
+        sock.write(buf, length)
+
+        self.status = self._read_response()
+        return self.status
+
+    def _format_len(self, value):
+        """Content-Length değerini sabit tampona yaz, basamak sayısını dön"""
+        n = 0
+        scale = 1
+        while value // scale >= 10:
+            scale *= 10
+        while scale:
+            self._len_buf[n] = 48 + (value // scale) % 10
+            n += 1
+            scale //= 10
+        return n
+
+    def _read_response(self):
+        """
+        Cevabı sabit tampona oku: durum kodunu ayrıştır, gövdeyi tüket
+        (keep-alive soketinin bir sonraki istek için temiz kalması gerekir)
+        """
+        resp = self._resp
+        size = len(resp)
+        filled = 0
+        header_end = -1
+
+        while header_end < 0:
+            if filled >= size:
+                raise OSError("HTTP header too large")
+            # Cevap neredeyse her zaman tek parçada gelir; nadir durumda dilim kullanılır
+            if filled == 0:
+                n = self.sock.readinto(resp)
+            else:
+                n = self.sock.readinto(self._resp_mv[filled:])
+            if not n:
+                raise OSError("Connection closed by server")
+            filled += n
+            header_end = self._find_header_end(filled)
+
+        # "HTTP/1.1 201 ..." → durum kodu 9-11. baytlarda
+        status = (resp[9] - 48) * 100 + (resp[10] - 48) * 10 + (resp[11] - 48)
+
+        body_len = self._content_length(header_end)
+        if body_len < 0:
+            # Uzunluk bilinmiyor, soket bir sonraki istek için güvenilir değil
+            self.close()
+            return status
+
+        remaining = body_len - (filled - header_end)
+        while remaining > 0:
+            n = self.sock.readinto(resp, remaining if remaining < size else size)
+            if not n:
+                raise OSError("Connection closed by server")
+            remaining -= n
+
+        return status
+
+    def _find_header_end(self, filled):
+        """Başlık sonunu (\\r\\n\\r\\n) bul, gövdenin başladığı indeksi dön"""
+        resp = self._resp
+        for i in range(3, filled):
+            if (
+                resp[i] == 10
+                and resp[i - 1] == 13
+                and resp[i - 2] == 10
+                and resp[i - 3] == 13
+            ):
+                return i + 1
+        return -1
+
+    def _content_length(self, header_end):
+        """Content-Length başlığını ayrıştır (yoksa -1)"""
+        resp = self._resp
+        key = _CONTENT_LENGTH
+        key_len = len(key)
+        i = 0
+        while i < header_end:
+            # Satır başında anahtarı büyük/küçük harf duyarsız karşılaştır
+            j = 0
+            while j < key_len and i + j < header_end:
+                c = resp[i + j]
+                if 65 <= c <= 90:
+                    c += 32
+                if c != key[j]:
+                    break
+                j += 1
+            if j == key_len:
+                i += key_len
+                value = 0
+                while i < header_end and resp[i] == 32:
+                    i += 1
+                while i < header_end and 48 <= resp[i] <= 57:
+                    value = value * 10 + resp[i] - 48
+                    i += 1
+                return value
+            # Sonraki satıra geç
+            while i < header_end and resp[i] != 10:
+                i += 1
+            i += 1
+        return -1
@@ -2,10 +2,28 @@ import mongoose, { Document, Schema } from "mongoose";
 
 export interface ISensorData extends Document {
   timestamp: Date;
-  temperature: number;
-  humidity: number;
-  bodyTemperature: number;
+  // Okunamayan sensör alanları null saklanır
+  temperature: number | null;
+  humidity: number | null;
+  bodyTemperature: number | null;
   deviceId: string;
+  installId?: number; // seq'in ait olduğu kurulum kimliği (cihazın seq.dat dosyası)
+  seq?: number; // Kurulum başına artan sıra numarası (tekrar ayıklama anahtarı)
+  bootEpoch?: number; // Cihazın kaçıncı açılışında ölçüldüğü
+  // Toplu (rollup) kayıtlar: cihaz kesinti sırasında min/max/ortalama kovaları gönderir
+  resolution?: number; // Kova genişliği (saniye), ham ölçümlerde yok
+  samples?: number; // Kovadaki ölçüm sayısı
+  stats?: {
+    temperature?: { min?: number; max?: number };
+    humidity?: { min?: number; max?: number };
+    bodyTemperature?: { min?: number; max?: number };
+  };
+  // Cihazdaki sensör füzyonunun alan başına güveni (0-100)
+  confidence?: {
+    temperature?: number | null;
+    humidity?: number | null;
+    bodyTemperature?: number | null;
+  };
   alerts?: Array<{
     type: string;
     value: number;
@@ -23,19 +41,19 @@ const SensorDataSchema = new Schema<ISensorData>(
     },
     temperature: {
       type: Number,
-      required: true,
+      default: null,
       min: -10,
       max: 50,
     },
     humidity: {
       type: Number,
-      required: true,
+      default: null,
       min: 0,
       max: 100,
     },
     bodyTemperature: {
       type: Number,
-      required: true,
+      default: null,
       min: 10, // MLX90614 can read room temperature (10-50°C range)
       max: 50,
     },
@@ -44,6 +62,36 @@ const SensorDataSchema = new Schema<ISensorData>(
       required: true,
       index: true,
     },
+    installId: {
+      type: Number,
+      min: 0,
+    },
+    seq: {
+      type: Number,
+      min: 0,
+    },
+    bootEpoch: {
+      type: Number,
+      min: 0,
+    },
+    resolution: {
+      type: Number,
+      min: 1,
+    },
+    samples: {
+      type: Number,
+      min: 1,
+    },
+    stats: {
+      temperature: { min: Number, max: Number },
+      humidity: { min: Number, max: Number },
+      bodyTemperature: { min: Number, max: Number },
+    },
+    confidence: {
+      temperature: { type: Number, min: 0, max: 100 },
+      humidity: { type: Number, min: 0, max: 100 },
+      bodyTemperature: { type: Number, min: 0, max: 100 },
+    },
     alerts: [
       {
         type: {
@@ -76,6 +124,15 @@ SensorDataSchema.index({ timestamp: 1 }, { expireAfterSeconds: 2592000 });
 // Compound index for deviceId + timestamp queries
 SensorDataSchema.index({ deviceId: 1, timestamp: -1 });
 
+// Idempotent delivery: aynı (deviceId, installId, resolution, seq) sadece bir kez saklanır
+// seq göndermeyen eski firmware kayıtları indeks dışında kalır; cihazın sıra
+// dosyası kaybolursa numaralar yeni installId ile 0'dan başlar, çakışmaz.
+// Toplu kovalar ilk örneklerinin seq'ini taşır, resolution ile ayrı anahtar uzayındadır
+SensorDataSchema.index(
+  { deviceId: 1, installId: 1, resolution: 1, seq: 1 },
+  { unique: true, partialFilterExpression: { seq: { $exists: true } } }
+);
+
 export const SensorData = mongoose.model<ISensorData>(
   "SensorData",
   SensorDataSchema
@@ -12,6 +12,11 @@ dotenv.config();
 
 const app = express();
 const server = http.createServer(app);
+
+// ESP32 tek bir keep-alive bağlantısını gönderimler arasında yeniden kullanır
+// Varsayılan 5 sn, gönderim aralığına eşit olduğu için bağlantı her seferinde kopuyordu
+server.keepAliveTimeout = 65000;
+server.headersTimeout = 66000;
 const io = new SocketIOServer(server, {
   cors: {
     origin: process.env.CORS_ORIGIN || "http://localhost:5173",
@@ -35,6 +40,8 @@ mongoose
   .connect(MONGODB_URI)
   .then(() => {
     console.log("MongoDB connected successfully");
+    // Eski tekrar ayıklama indekslerini kaldır, yenisini oluştur
+    return SensorData.syncIndexes();
   })
   .catch((error) => {
     console.error("MongoDB connection error:", error);
@@ -77,11 +84,12 @@ async function getThresholdsFromDB(deviceId: string) {
 }
 
 // Helper function to check thresholds and generate alerts
+// Okunamayan (null) alanlar için alarm üretilmez
 function checkThresholds(
   data: {
-    temperature: number;
-    humidity: number;
-    bodyTemperature: number;
+    temperature: number | null;
+    humidity: number | null;
+    bodyTemperature: number | null;
   },
   thresholds: {
     temperature: { min: number; max: number };
@@ -99,7 +107,9 @@ function checkThresholds(
     threshold: { min?: number; max?: number };
   }> = [];
 
-  if (data.temperature < thresholds.temperature.min) {
+  if (data.temperature === null) {
+    // Sensör okunamadı
+  } else if (data.temperature < thresholds.temperature.min) {
     alerts.push({
       type: "temperature_low",
       value: data.temperature,
@@ -113,7 +123,9 @@ function checkThresholds(
     });
   }
 
-  if (data.humidity < thresholds.humidity.min) {
+  if (data.humidity === null) {
+    // Sensör okunamadı
+  } else if (data.humidity < thresholds.humidity.min) {
     alerts.push({
       type: "humidity_low",
       value: data.humidity,
@@ -127,7 +139,9 @@ function checkThresholds(
     });
   }
 
-  if (data.bodyTemperature < thresholds.bodyTemperature.min) {
+  if (data.bodyTemperature === null) {
+    // Sensör okunamadı
+  } else if (data.bodyTemperature < thresholds.bodyTemperature.min) {
     alerts.push({
       type: "body_temp_low",
       value: data.bodyTemperature,
@@ -144,6 +158,151 @@ function checkThresholds(
   return alerts;
 }
 
+// Cihazdan gelen tek bir ölçümü (ham veya toplu kova) veritabanı belgesine çevir
+function toSensorDocument(
+  record: {
+    temperature?: number | null;
+    humidity?: number | null;
+    bodyTemperature?: number | null;
+    deviceId: string;
+    timestamp?: string;
+    installId?: number | null;
+    seq?: number;
+    bootEpoch?: number;
+    resolution?: number;
+    samples?: number;
+    stats?: Record<string, { min?: number; max?: number }>;
+    confidence?: Record<string, number | null>;
+  },
+  thresholds: Awaited<ReturnType<typeof getThresholdsFromDB>>,
+  now: Date
+) {
+  const {
+    temperature,
+    humidity,
+    bodyTemperature,
+    deviceId,
+    timestamp,
+    installId,
+    seq,
+    bootEpoch,
+    resolution,
+    samples,
+    stats,
+    confidence,
+  } = record;
+
+  // Cihaz NTP senkronize ise ölçüm anını gönderir (tamponlanmış veriler için önemli)
+  // Gelecekteki zamanlar saat hatası sayılır ve sunucu zamanı kullanılır
+  const measuredAt = timestamp ? new Date(timestamp) : now;
+  const recordedAt = measuredAt > now ? now : measuredAt;
+
+  // Gönderilmeyen ölçüm alanları null olarak saklanır
+  const values = {
+    temperature: temperature ?? null,
+    humidity: humidity ?? null,
+    bodyTemperature: bodyTemperature ?? null,
+  };
+  const alerts = checkThresholds(values, thresholds);
+
+  return {
+    ...values,
+    deviceId,
+    timestamp: recordedAt,
+    installId: installId ?? undefined,
+    seq,
+    bootEpoch,
+    resolution,
+    samples,
+    stats,
+    confidence,
+    alerts: alerts.length > 0 ? alerts : undefined,
+  };
+}
+
+// Tekrar ayıklama anahtarı: seq, cihazın kurulum kimliği (installId) içinde tekildir
+// (installId göndermeyen eski firmware kayıtlarında null)
+// Toplu kovalar ilk örneklerinin seq'ini taşır: resolution (ham kayıtta null) ile
+// her çözünürlük ayrı anahtar uzayında kalır, kova ham kaydın tekrarı sayılmaz
+function dedupKey(record: {
+  deviceId: string;
+  installId?: number | null;
+  resolution?: number;
+  seq?: number;
+}) {
+  return {
+    deviceId: record.deviceId,
+    installId: record.installId ?? null,
+    resolution: record.resolution ?? null,
+    seq: record.seq,
+  };
+}
+
+// MongoDB duplicate key hatası mı? ((deviceId, installId, resolution, seq) unique index)
+function isDuplicateKeyError(error: unknown): boolean {
+  return (error as { code?: number })?.code === 11000;
+}
+
+// Ölçüm alanları için doğrulama kuralları (prefix: "" veya "records.*.")
+// Okunamayan sensör alanları null gelebilir (veya hiç gönderilmez): bir sensörün
+// arızası kaydın ya da batch'in tamamının reddedilmesine yol açmamalı
+function sensorValidators(prefix: string) {
+  return [
+    body(`${prefix}temperature`)
+      .optional({ values: "null" })
+      .isFloat({ min: -10, max: 50 })
+      .withMessage("Invalid temperature"),
+    body(`${prefix}humidity`)
+      .optional({ values: "null" })
+      .isFloat({ min: 0, max: 100 })
+      .withMessage("Invalid humidity"),
+    body(`${prefix}bodyTemperature`)
+      .optional({ values: "null" })
+      .isFloat({ min: 10, max: 50 })
+      .withMessage("Invalid body temperature (must be between 10-50°C)"),
+    body(`${prefix}deviceId`)
+      .isString()
+      .notEmpty()
+      .withMessage("Device ID is required"),
+    body(`${prefix}timestamp`)
+      .optional()
+      .isISO8601()
+      .withMessage("Invalid timestamp (must be ISO 8601)"),
+    body(`${prefix}installId`)
+      .optional({ values: "null" })
+      .isInt({ min: 0 })
+      .withMessage("Invalid install ID"),
+    body(`${prefix}seq`)
+      .optional()
+      .isInt({ min: 0 })
+      .withMessage("Invalid sequence number"),
+    body(`${prefix}bootEpoch`)
+      .optional()
+      .isInt({ min: 0 })
+      .withMessage("Invalid boot epoch"),
+    body(`${prefix}resolution`)
+      .optional()
+      .isInt({ min: 1 })
+      .withMessage("Invalid rollup resolution (seconds)"),
+    body(`${prefix}samples`)
+      .optional()
+      .isInt({ min: 1 })
+      .withMessage("Invalid rollup sample count"),
+    body(`${prefix}stats`)
+      .optional()
+      .isObject()
+      .withMessage("Invalid rollup stats"),
+    body(`${prefix}confidence`)
+      .optional()
+      .isObject()
+      .withMessage("Invalid confidence"),
+    body(`${prefix}confidence.*`)
+      .optional({ values: "null" })
+      .isInt({ min: 0, max: 100 })
+      .withMessage("Invalid confidence (must be between 0-100)"),
+  ];
+}
+
 // Routes
 
 // Health check
@@ -152,20 +311,11 @@ app.get("/health", (_req: Request, res: Response) => {
 });
 
 // POST /api/sensors - Receive sensor data from ESP32
+// seq gönderilirse (deviceId, installId, resolution, seq) üzerinden upsert yapılır:
+// tekrar gönderim 200 döner
 app.post(
   "/api/sensors",
-  [
-    body("temperature")
-      .isFloat({ min: -10, max: 50 })
-      .withMessage("Invalid temperature"),
-    body("humidity")
-      .isFloat({ min: 0, max: 100 })
-      .withMessage("Invalid humidity"),
-    body("bodyTemperature")
-      .isFloat({ min: 10, max: 50 })
-      .withMessage("Invalid body temperature (must be between 10-50°C)"),
-    body("deviceId").isString().notEmpty().withMessage("Device ID is required"),
-  ],
+  sensorValidators(""),
   async (req: Request, res: Response) => {
     const errors = validationResult(req);
     if (!errors.isEmpty()) {
@@ -173,7 +323,8 @@ app.post(
     }
 
     try {
-      const { temperature, humidity, bodyTemperature, deviceId } = req.body;
+      const { temperature, humidity, bodyTemperature, deviceId, seq } =
+        req.body;
 
       // Get dynamic thresholds from database
       const thresholds = await getThresholdsFromDB(deviceId);
@@ -186,44 +337,60 @@ app.post(
         temperature,
         humidity,
         bodyTemperature,
+        seq,
       });
 
-      // Check thresholds
-      const alerts = checkThresholds(
-        {
-          temperature,
-          humidity,
-          bodyTemperature,
-        },
-        thresholds
-      );
+      const doc = toSensorDocument(req.body, thresholds, new Date());
+      const alerts = doc.alerts || [];
 
       console.log(
         `🚨 Generated alerts:`,
         alerts.length > 0 ? JSON.stringify(alerts, null, 2) : "No alerts"
       );
 
-      // Save to MongoDB
-      const sensorData = new SensorData({
-        temperature,
-        humidity,
-        bodyTemperature,
-        deviceId,
-        timestamp: new Date(),
-        alerts: alerts.length > 0 ? alerts : undefined,
-      });
-
-      await sensorData.save();
+      // Save to MongoDB (seq varsa idempotent)
+      let id;
+      if (seq !== undefined) {
+        let inserted = false;
+        try {
+          const result = await SensorData.updateOne(
+            dedupKey(req.body),
+            { $setOnInsert: doc },
+            { upsert: true }
+          );
+          inserted = result.upsertedCount > 0;
+          id = result.upsertedId;
+        } catch (error) {
+          // Eşzamanlı aynı istek: unique index yarışı kaybedildi
+          if (!isDuplicateKeyError(error)) {
+            throw error;
+          }
+        }
+
+        if (!inserted) {
+          console.log(`♻️  Duplicate sensor data ignored: ${deviceId}#${seq}`);
+          return res.status(200).json({
+            success: true,
+            duplicate: true,
+            message: "Sensor data already stored",
+            data: { ackedSeq: seq },
+          });
+        }
+      } else {
+        const sensorData = await new SensorData(doc).save();
+        id = sensorData._id;
+      }
 
       // Broadcast to all connected WebSocket clients
       const broadcastData = {
-        id: sensorData._id.toString(),
-        temperature: sensorData.temperature,
-        humidity: sensorData.humidity,
-        bodyTemperature: sensorData.bodyTemperature,
-        deviceId: sensorData.deviceId,
-        timestamp: sensorData.timestamp.toISOString(),
-        alerts: sensorData.alerts || [],
+        id: String(id),
+        temperature: doc.temperature,
+        humidity: doc.humidity,
+        bodyTemperature: doc.bodyTemperature,
+        deviceId: doc.deviceId,
+        timestamp: doc.timestamp.toISOString(),
+        confidence: doc.confidence,
+        alerts,
       };
 
       console.log(
@@ -243,8 +410,9 @@ app.post(
         success: true,
         message: "Sensor data saved successfully",
         data: {
-          id: sensorData._id,
-          timestamp: sensorData.timestamp,
+          id,
+          timestamp: doc.timestamp,
+          ackedSeq: seq,
         },
       });
     } catch (error) {
@@ -257,6 +425,96 @@ app.post(
   }
 );
 
+// POST /api/sensors/bulk - Tamponlanmış / toplu (rollup) kayıtların toplu gönderimi
+// (deviceId, installId, resolution, seq) üzerinden upsert: yeniden gönderilen batch'ler
+// çift kayıt oluşturmaz
+app.post(
+  "/api/sensors/bulk",
+  [
+    body("records")
+      .isArray({ min: 1, max: 100 })
+      .withMessage("records must be an array of 1-100 items"),
+    ...sensorValidators("records.*."),
+  ],
+  async (req: Request, res: Response) => {
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ errors: errors.array() });
+    }
+
+    try {
+      const records = req.body.records as Array<Parameters<
+        typeof toSensorDocument
+      >[0]>;
+      const now = new Date();
+
+      // Eşik değerleri cihaz başına bir kez okunur
+      const thresholdCache = new Map<
+        string,
+        Awaited<ReturnType<typeof getThresholdsFromDB>>
+      >();
+      const operations = [];
+      let ackedSeq: number | undefined;
+
+      for (const record of records) {
+        let thresholds = thresholdCache.get(record.deviceId);
+        if (!thresholds) {
+          thresholds = await getThresholdsFromDB(record.deviceId);
+          thresholdCache.set(record.deviceId, thresholds);
+        }
+        const doc = toSensorDocument(record, thresholds, now);
+
+        if (record.seq !== undefined) {
+          operations.push({
+            updateOne: {
+              filter: dedupKey(record),
+              update: { $setOnInsert: doc },
+              upsert: true,
+            },
+          });
+          ackedSeq = Math.max(ackedSeq ?? record.seq, record.seq);
+        } else {
+          operations.push({ insertOne: { document: doc } });
+        }
+      }
+
+      let inserted = 0;
+      try {
+        const result = await SensorData.bulkWrite(operations, {
+          ordered: false,
+        });
+        inserted = result.upsertedCount + result.insertedCount;
+      } catch (error) {
+        // Eşzamanlı tekrar gönderimde unique index yarışı: diğer işlemler uygulandı
+        if (!isDuplicateKeyError(error)) {
+          throw error;
+        }
+        const result = (
+          error as { result?: { upsertedCount?: number; insertedCount?: number } }
+        ).result;
+        inserted = (result?.upsertedCount ?? 0) + (result?.insertedCount ?? 0);
+      }
+
+      const duplicates = records.length - inserted;
+      console.log(
+        `📦 Bulk sensor data: ${inserted} stored, ${duplicates} duplicates ignored`
+      );
+
+      res.status(200).json({
+        success: true,
+        message: "Bulk sensor data processed",
+        data: { inserted, duplicates, ackedSeq },
+      });
+    } catch (error) {
+      console.error("Error saving bulk sensor data:", error);
+      res.status(500).json({
+        success: false,
+        message: "Failed to save bulk sensor data",
+      });
+    }
+  }
+);
+
 // GET /api/sensors/latest - Get latest sensor data
 app.get("/api/sensors/latest", async (req: Request, res: Response) => {
   try {
@@ -283,6 +541,7 @@ app.get("/api/sensors/latest", async (req: Request, res: Response) => {
         bodyTemperature: latestData.bodyTemperature,
         deviceId: latestData.deviceId,
         timestamp: latestData.timestamp.toISOString(),
+        confidence: latestData.confidence,
         alerts: latestData.alerts || [],
       },
     });
@@ -326,6 +585,9 @@ app.get("/api/sensors/history", async (req: Request, res: Response) => {
         bodyTemperature: item.bodyTemperature,
         deviceId: item.deviceId,
         timestamp: item.timestamp.toISOString(),
+        resolution: item.resolution,
+        stats: item.stats,
+        confidence: item.confidence,
         alerts: item.alerts || [],
       })),
     });
@@ -6,9 +6,9 @@ interface SensorData {
   id: string;
   deviceId: string;
   timestamp: string;
-  temperature: number;
-  humidity: number;
-  bodyTemperature: number;
+  temperature: number | null;
+  humidity: number | null;
+  bodyTemperature: number | null;
   alerts?: Array<{
     type: string;
     value: number;
@@ -112,22 +112,22 @@ export function useSensorData(): UseSensorDataReturn {
           );
 
           const alertMessages: Record<string, string> = {
-            temperature_high: `🌡️ Yüksek ortam sıcaklığı: ${data.temperature.toFixed(
+            temperature_high: `🌡️ Yüksek ortam sıcaklığı: ${alert.value.toFixed(
               1
             )}°C (Normal: ${alert.threshold.min}-${alert.threshold.max}°C)`,
-            temperature_low: `❄️ Düşük ortam sıcaklığı: ${data.temperature.toFixed(
+            temperature_low: `❄️ Düşük ortam sıcaklığı: ${alert.value.toFixed(
               1
             )}°C (Normal: ${alert.threshold.min}-${alert.threshold.max}°C)`,
-            humidity_high: `💧 Yüksek nem: ${data.humidity.toFixed(
+            humidity_high: `💧 Yüksek nem: ${alert.value.toFixed(
               1
             )}% (Normal: ${alert.threshold.min}-${alert.threshold.max}%)`,
-            humidity_low: `🏜️ Düşük nem: ${data.humidity.toFixed(
+            humidity_low: `🏜️ Düşük nem: ${alert.value.toFixed(
               1
             )}% (Normal: ${alert.threshold.min}-${alert.threshold.max}%)`,
-            body_temp_high: `🚨 Yüksek vücut sıcaklığı: ${data.bodyTemperature.toFixed(
+            body_temp_high: `🚨 Yüksek vücut sıcaklığı: ${alert.value.toFixed(
               1
             )}°C (Normal: ${alert.threshold.min}-${alert.threshold.max}°C)`,
-            body_temp_low: `🧊 Düşük vücut sıcaklığı: ${data.bodyTemperature.toFixed(
+            body_temp_low: `🧊 Düşük vücut sıcaklığı: ${alert.value.toFixed(
               1
             )}°C (Normal: ${alert.threshold.min}-${alert.threshold.max}°C)`,
           };
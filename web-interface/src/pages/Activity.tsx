@@ -13,6 +13,7 @@ import { useEffect, useMemo, useState } from "react";
 import { useSensorData } from "../hooks/useSensorData";
 import { defaultThresholds } from "../mock-up-datas/data";
 import type { SensorData } from "../types/data";
+import { formatReading } from "../utils/format";
 
 type EventSeverity = "low" | "medium" | "high";
 type DeviceEvent = {
@@ -65,21 +66,26 @@ export default function Activity() {
     newEvents.push({
       id: `evt-latest-${currentData.timestamp}`,
       type: "sensor_reading",
-      message: `Yeni ölçüm alındı: Sıcaklık ${currentData.temperature.toFixed(
-        1
-      )}°C, Nem %${currentData.humidity.toFixed(
-        1
-      )}, Vücut ${currentData.bodyTemperature.toFixed(1)}°C`,
+      message: `Yeni ölçüm alındı: Sıcaklık ${formatReading(
+        currentData.temperature
+      )}°C, Nem %${formatReading(
+        currentData.humidity
+      )}, Vücut ${formatReading(currentData.bodyTemperature)}°C`,
       timestamp: currentData.timestamp,
       severity: "low",
     });
 
+    // Eşik kontrolleri sadece okunabilen değerler için yapılır
+    const { bodyTemperature, humidity, temperature } = currentData;
+
     // Vücut sıcaklığı kontrolleri
-    if (currentData.bodyTemperature > defaultThresholds.bodyTemperature.max) {
+    if (bodyTemperature === null) {
+      // Sensör okunamadı
+    } else if (bodyTemperature > defaultThresholds.bodyTemperature.max) {
       newEvents.push({
         id: `evt-body-high-${currentData.timestamp}`,
         type: "sensor_reading",
-        message: `⚠️ Yüksek vücut sıcaklığı tespit edildi: ${currentData.bodyTemperature.toFixed(
+        message: `⚠️ Yüksek vücut sıcaklığı tespit edildi: ${bodyTemperature.toFixed(
           1
         )}°C (Normal: ${defaultThresholds.bodyTemperature.min}-${
           defaultThresholds.bodyTemperature.max
@@ -87,13 +93,11 @@ export default function Activity() {
         timestamp: currentData.timestamp,
         severity: "high",
       });
-    } else if (
-      currentData.bodyTemperature < defaultThresholds.bodyTemperature.min
-    ) {
+    } else if (bodyTemperature < defaultThresholds.bodyTemperature.min) {
       newEvents.push({
         id: `evt-body-low-${currentData.timestamp}`,
         type: "sensor_reading",
-        message: `⚠️ Düşük vücut sıcaklığı tespit edildi: ${currentData.bodyTemperature.toFixed(
+        message: `⚠️ Düşük vücut sıcaklığı tespit edildi: ${bodyTemperature.toFixed(
           1
         )}°C (Normal: ${defaultThresholds.bodyTemperature.min}-${
           defaultThresholds.bodyTemperature.max
@@ -104,11 +108,13 @@ export default function Activity() {
     }
 
     // Nem kontrolleri
-    if (currentData.humidity > defaultThresholds.humidity.max) {
+    if (humidity === null) {
+      // Sensör okunamadı
+    } else if (humidity > defaultThresholds.humidity.max) {
       newEvents.push({
         id: `evt-humidity-high-${currentData.timestamp}`,
         type: "sensor_reading",
-        message: `⚠️ Yüksek nem seviyesi: %${currentData.humidity.toFixed(
+        message: `⚠️ Yüksek nem seviyesi: %${humidity.toFixed(
           1
         )} (Normal: %${defaultThresholds.humidity.min}-%${
           defaultThresholds.humidity.max
@@ -116,11 +122,11 @@ export default function Activity() {
         timestamp: currentData.timestamp,
         severity: "medium",
       });
-    } else if (currentData.humidity < defaultThresholds.humidity.min) {
+    } else if (humidity < defaultThresholds.humidity.min) {
       newEvents.push({
         id: `evt-humidity-low-${currentData.timestamp}`,
         type: "sensor_reading",
-        message: `⚠️ Düşük nem seviyesi: %${currentData.humidity.toFixed(
+        message: `⚠️ Düşük nem seviyesi: %${humidity.toFixed(
           1
         )} (Normal: %${defaultThresholds.humidity.min}-%${
           defaultThresholds.humidity.max
@@ -131,11 +137,13 @@ export default function Activity() {
     }
 
     // Sıcaklık kontrolleri
-    if (currentData.temperature > defaultThresholds.temperature.max) {
+    if (temperature === null) {
+      // Sensör okunamadı
+    } else if (temperature > defaultThresholds.temperature.max) {
       newEvents.push({
         id: `evt-temp-high-${currentData.timestamp}`,
         type: "sensor_reading",
-        message: `⚠️ Yüksek oda sıcaklığı: ${currentData.temperature.toFixed(
+        message: `⚠️ Yüksek oda sıcaklığı: ${temperature.toFixed(
           1
         )}°C (Normal: ${defaultThresholds.temperature.min}-${
           defaultThresholds.temperature.max
@@ -143,11 +151,11 @@ export default function Activity() {
         timestamp: currentData.timestamp,
         severity: "medium",
       });
-    } else if (currentData.temperature < defaultThresholds.temperature.min) {
+    } else if (temperature < defaultThresholds.temperature.min) {
       newEvents.push({
         id: `evt-temp-low-${currentData.timestamp}`,
         type: "sensor_reading",
-        message: `⚠️ Düşük oda sıcaklığı: ${currentData.temperature.toFixed(
+        message: `⚠️ Düşük oda sıcaklığı: ${temperature.toFixed(
           1
         )}°C (Normal: ${defaultThresholds.temperature.min}-${
           defaultThresholds.temperature.max
@@ -162,11 +170,11 @@ export default function Activity() {
       newEvents.push({
         id: `evt-history-${data.timestamp}-${index}`,
         type: "sensor_reading",
-        message: `Ölçüm kaydı: Sıcaklık ${data.temperature.toFixed(
-          1
-        )}°C, Nem %${data.humidity.toFixed(
-          1
-        )}, Vücut ${data.bodyTemperature.toFixed(1)}°C`,
+        message: `Ölçüm kaydı: Sıcaklık ${formatReading(
+          data.temperature
+        )}°C, Nem %${formatReading(
+          data.humidity
+        )}, Vücut ${formatReading(data.bodyTemperature)}°C`,
         timestamp: data.timestamp,
         severity: "low",
       });
@@ -338,7 +346,7 @@ export default function Activity() {
             <h3 className="font-semibold text-gray-900">Nem</h3>
           </div>
           <div className="text-2xl font-bold text-gray-900">
-            {currentData ? `%${currentData.humidity.toFixed(1)}` : "--"}
+            {currentData ? `%${formatReading(currentData.humidity)}` : "--"}
           </div>
           <div className="text-xs text-gray-500">
             {currentData
@@ -354,7 +362,7 @@ export default function Activity() {
             <h3 className="font-semibold text-gray-900">Ortam Sıcaklığı</h3>
           </div>
           <div className="text-2xl font-bold text-gray-900">
-            {currentData ? `${currentData.temperature.toFixed(1)}°C` : "--"}
+            {currentData ? `${formatReading(currentData.temperature)}°C` : "--"}
           </div>
           <div className="text-xs text-gray-500">
             {currentData
@@ -370,7 +378,9 @@ export default function Activity() {
             <h3 className="font-semibold text-gray-900">Vücut Sıcaklığı</h3>
           </div>
           <div className="text-2xl font-bold text-gray-900">
-            {currentData ? `${currentData.bodyTemperature.toFixed(1)}°C` : "--"}
+            {currentData
+              ? `${formatReading(currentData.bodyTemperature)}°C`
+              : "--"}
           </div>
           <div className="text-xs text-gray-500">
             {currentData
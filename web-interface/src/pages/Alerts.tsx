@@ -14,6 +14,7 @@ import {
 import { useSensorData } from "../hooks/useSensorData";
 import { defaultThresholds } from "../mock-up-datas/data";
 import type { SensorData } from "../types/data";
+import { formatReading } from "../utils/format";
 
 type AlertSeverity = "low" | "medium" | "high";
 type AlertType =
@@ -257,7 +258,7 @@ export default function Alerts() {
                   padding: "8px",
                 }}
                 formatter={(value) => [
-                  `${(value as number).toFixed(1)}°C`,
+                  `${formatReading(value as number | null)}°C`,
                   "Vücut Sıcaklığı",
                 ]}
                 labelStyle={{ fontWeight: "bold", marginBottom: "4px" }}
@@ -337,7 +338,7 @@ export default function Alerts() {
                   padding: "8px",
                 }}
                 formatter={(value) => [
-                  `${(value as number).toFixed(1)}°C`,
+                  `${formatReading(value as number | null)}°C`,
                   "Ortam Sıcaklığı",
                 ]}
                 labelStyle={{ fontWeight: "bold", marginBottom: "4px" }}
@@ -417,7 +418,7 @@ export default function Alerts() {
                   padding: "8px",
                 }}
                 formatter={(value) => [
-                  `${(value as number).toFixed(1)}%`,
+                  `${formatReading(value as number | null)}%`,
                   "Nem Oranı",
                 ]}
                 labelStyle={{ fontWeight: "bold", marginBottom: "4px" }}
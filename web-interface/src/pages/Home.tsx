@@ -21,6 +21,7 @@ import {
 import { useSensorData } from "../hooks/useSensorData";
 import { defaultThresholds } from "../mock-up-datas/data";
 import type { SensorData } from "../types/data";
+import { formatReading } from "../utils/format";
 
 export default function Home() {
   const { sensorData, isConnected, isLoading, error } = useSensorData();
@@ -29,7 +30,7 @@ export default function Home() {
   const [chartData, setChartData] = useState<
     Array<{
       time: string;
-      bodyTemp: number;
+      bodyTemp: number | null;
       timestamp: string;
     }>
   >([]);
@@ -74,7 +75,8 @@ export default function Home() {
   }, [sensorData]);
 
   // Değer durumu kontrolü
-  const getValueStatus = (value: number, min: number, max: number) => {
+  const getValueStatus = (value: number | null, min: number, max: number) => {
+    if (value === null) return "normal";
     if (value < min) return "low";
     if (value > max) return "high";
     return "normal";
@@ -113,6 +115,11 @@ export default function Home() {
     }
   };
 
+  // En yüksek/düşük kayıt sadece okunabilen ölçümlerden hesaplanır
+  const bodyTemps = chartData
+    .map((d) => d.bodyTemp)
+    .filter((t): t is number => t !== null);
+
   const formatTime = (timestamp: string) => {
     return new Date(timestamp).toLocaleTimeString("tr-TR", {
       hour: "2-digit",
@@ -219,7 +226,7 @@ export default function Home() {
 
           <div className="space-y-2">
             <div className="text-3xl font-bold text-gray-900">
-              {currentData ? currentData.temperature.toFixed(1) : "--"}°C
+              {formatReading(currentData?.temperature)}°C
             </div>
             <div className="text-sm text-gray-600">
               Normal aralık: {defaultThresholds.temperature.min}°C -{" "}
@@ -256,7 +263,7 @@ export default function Home() {
 
           <div className="space-y-2">
             <div className="text-3xl font-bold text-gray-900">
-              %{currentData ? currentData.humidity.toFixed(1) : "--"}
+              %{formatReading(currentData?.humidity)}
             </div>
             <div className="text-sm text-gray-600">
               Normal aralık: %{defaultThresholds.humidity.min} - %
@@ -293,7 +300,7 @@ export default function Home() {
 
           <div className="space-y-2">
             <div className="text-3xl font-bold text-gray-900">
-              {currentData ? currentData.bodyTemperature.toFixed(1) : "--"}°C
+              {formatReading(currentData?.bodyTemperature)}°C
             </div>
             <div className="text-sm text-gray-600">
               Normal aralık: {defaultThresholds.bodyTemperature.min}°C -{" "}
@@ -376,8 +383,8 @@ export default function Home() {
                   border: "1px solid #e5e7eb",
                   borderRadius: "8px",
                 }}
-                formatter={(value: number) => [
-                  `${value.toFixed(1)}°C`,
+                formatter={(value: number | null) => [
+                  `${formatReading(value)}°C`,
                   "Vücut Sıcaklığı",
                 ]}
                 labelFormatter={(label) => `Saat: ${label}`}
@@ -423,18 +430,18 @@ export default function Home() {
               {defaultThresholds.bodyTemperature.max}°C
             </p>
           </div>
-          {chartData.length > 0 && (
+          {bodyTemps.length > 0 && (
             <>
               <div className="p-3 bg-red-50 rounded-lg border border-red-200">
                 <p className="text-gray-600">En Yüksek Kayıt</p>
                 <p className="font-semibold text-red-700">
-                  {Math.max(...chartData.map((d) => d.bodyTemp)).toFixed(1)}°C
+                  {Math.max(...bodyTemps).toFixed(1)}°C
                 </p>
               </div>
               <div className="p-3 bg-blue-50 rounded-lg border border-blue-200">
                 <p className="text-gray-600">En Düşük Kayıt</p>
                 <p className="font-semibold text-blue-700">
-                  {Math.min(...chartData.map((d) => d.bodyTemp)).toFixed(1)}°C
+                  {Math.min(...bodyTemps).toFixed(1)}°C
                 </p>
               </div>
             </>
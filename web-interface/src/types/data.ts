@@ -3,9 +3,10 @@ export interface SensorData {
   id: string;
   deviceId: string;
   timestamp: string;
-  temperature: number; // Ortam sıcaklığı (°C)
-  humidity: number; // Ortam nemi (%)
-  bodyTemperature: number; // Bebek vücut sıcaklığı (°C)
+  // Sensörü okunamayan (veya takılı olmayan) alanlar null gelir
+  temperature: number | null; // Ortam sıcaklığı (°C)
+  humidity: number | null; // Ortam nemi (%)
+  bodyTemperature: number | null; // Bebek vücut sıcaklığı (°C)
 }
 
 // Cihaz durumu union type
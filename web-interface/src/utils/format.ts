@@ -0,0 +1,7 @@
+// Sensör değerini gösterim için biçimlendir (sensör okunamadıysa "--")
+export function formatReading(
+  value: number | null | undefined,
+  digits = 1
+): string {
+  return value === null || value === undefined ? "--" : value.toFixed(digits);
+}